@@ -0,0 +1,22 @@
+"""Headless Streamlit page benchmarks via AppTest"""
+import os
+
+from harness import REPO_ROOT, bench
+
+APP_PATH = os.path.join(REPO_ROOT, "mlb_predictor_app.py")
+
+
+def booted_app():
+    """An AppTest whose first run has completed, so the prediction snapshot exists"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"App raised during boot: {app.exception[0].value}")
+    return app
+
+
+@bench("app/rerun", setup=booted_app, repeat=10)
+def rerun(app):
+    app.run()
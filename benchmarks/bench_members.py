@@ -0,0 +1,55 @@
+"""Fit/predict cost and Brier score of the estimators that can fill the SVM slot"""
+from sklearn.metrics import brier_score_loss
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from harness import bench
+from mlb_predictor import MLBPredictor
+from mlb_predictor.members import make_member
+from mlb_predictor.pipeline import scaled_copy
+
+SVM_SLOT_MEMBERS = ["svc", "rbf_logistic", "hist_gbm", "run_simulator"]
+SIZES = [1000, 4000]
+# Only members that scale linearly are timed at this size; svc would take minutes
+LARGE_SIZE = 50000
+
+
+def _split(n_samples, raw=False):
+    X, y = MLBPredictor().generate_training_data(n_samples)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    if raw:
+        return X_train, X_test, y_train, y_test
+    scaler = StandardScaler().fit(X_train)
+    return scaled_copy(X_train, scaler), scaled_copy(X_test, scaler), y_train, y_test
+
+
+def _register(member, n_samples):
+    def fit_setup():
+        return (member,) + _split(n_samples, getattr(make_member(member), "raw_features", False))
+
+    def predict_setup():
+        _, X_train, X_test, y_train, y_test = fit_setup()
+        return make_member(member).fit(X_train, y_train), X_test, y_test
+
+    def brier(context):
+        model, X_test, y_test = context
+        return {"brier": brier_score_loss(y_test, model.predict_proba(X_test)[:, 1])}
+
+    @bench(f"members/{member}/fit/n_samples={n_samples}", setup=fit_setup, repeat=3)
+    def fit(context):
+        name, X_train, _, y_train, _ = context
+        make_member(name).fit(X_train, y_train)
+
+    @bench(f"members/{member}/predict/n_samples={n_samples}", setup=predict_setup,
+           repeat=5, metrics=brier)
+    def predict(context):
+        model, X_test, _ = context
+        model.predict_proba(X_test)
+
+
+for _member in SVM_SLOT_MEMBERS:
+    for _n_samples in SIZES:
+        _register(_member, _n_samples)
+for _member in SVM_SLOT_MEMBERS:
+    if _member != "svc":
+        _register(_member, LARGE_SIZE)
@@ -0,0 +1,372 @@
+"""Training and scoring benchmarks for MLBPredictor"""
+import os
+import tempfile
+import tracemalloc
+from datetime import date
+
+import numpy as np
+
+from harness import bench
+from mlb_predictor import MLBPredictor, get_team_stats, get_todays_games, make_slate
+from mlb_predictor.forest import compile_forest
+from mlb_predictor.ingest import FixtureSource
+from mlb_predictor.model import ENSEMBLE_MEMBERS, RECENT_ROWS, load_latest
+from mlb_predictor.live import LiveOdds
+from mlb_predictor.odds import LineHistory
+from mlb_predictor.prediction_cache import PredictionCache
+from mlb_predictor.recommendations import build_predictions, prediction_frame
+from mlb_predictor.simulator import cover_probability
+from mlb_predictor.synthetic import chunk_rng, synthetic_chunk
+from mlb_predictor.tables import TEAMS
+
+TRAINING_SIZES = [500, 1000, 2000, 4000]
+
+# Core budgets compared on a dataset large enough to use worker processes
+TRAIN_JOBS = [1, 2, 4]
+PARALLEL_TRAIN_SAMPLES = 8000
+
+# Regular-season games in one MLB season
+SEASON_GAMES = 2430
+
+# Recorded schedule and odds responses the slate benchmarks replay
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "demo")
+FIXTURE_DAY = date(2024, 6, 1)
+
+
+def fitted_predictor():
+    predictor = MLBPredictor()
+    predictor.train_models()
+    return predictor
+
+
+def season_slate(n_games=SEASON_GAMES, seed=0):
+    """A season-sized slate of random matchups between distinct teams"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(len(TEAMS), size=n_games)
+    away = (home + rng.integers(1, len(TEAMS), size=n_games)) % len(TEAMS)
+    games = [
+        {"home": TEAMS[h], "away": TEAMS[a], "spread": -1.5 if i % 2 else 1.5}
+        for i, (h, a) in enumerate(zip(home, away))
+    ]
+    return make_slate(games)
+
+
+def _register_training(n_samples):
+    def setup():
+        return MLBPredictor().generate_training_data(n_samples)
+
+    @bench(f"train/n_samples={n_samples}", setup=setup, repeat=3)
+    def train(data):
+        MLBPredictor().train_models(*data)
+
+
+for _n_samples in TRAINING_SIZES:
+    _register_training(_n_samples)
+
+
+def _register_parallel_training(n_jobs):
+    def setup():
+        return MLBPredictor().generate_training_data(PARALLEL_TRAIN_SAMPLES)
+
+    @bench(f"train/n_jobs={n_jobs}", setup=setup, repeat=3)
+    def train(data):
+        MLBPredictor(n_jobs=n_jobs).fit(*data)
+
+
+for _n_jobs in TRAIN_JOBS:
+    _register_parallel_training(_n_jobs)
+
+
+# Nightly retrain: one day's games added to a multi-season history
+HISTORY_ROWS = 5000
+NEW_ROWS = 15
+
+
+def _history_context():
+    X, y = MLBPredictor().generate_training_data(HISTORY_ROWS + NEW_ROWS)
+    return MLBPredictor().fit(X[:HISTORY_ROWS], y[:HISTORY_ROWS]), X, y
+
+
+@bench(f"retrain/full/history={HISTORY_ROWS}", setup=_history_context, repeat=3)
+def retrain_full(context):
+    _, X, y = context
+    MLBPredictor().fit(X, y)
+
+
+@bench(f"retrain/update/history={HISTORY_ROWS}", setup=_history_context, repeat=5)
+def retrain_update(context):
+    predictor, X, y = context
+    predictor.update(X[-NEW_ROWS:], y[-NEW_ROWS:], X[-RECENT_ROWS:], y[-RECENT_ROWS:])
+
+
+def fixture_slate():
+    """The recorded demo day, priced from its odds fixture"""
+    return get_todays_games(FixtureSource(FIXTURES), day=FIXTURE_DAY)
+
+
+@bench("ingest/slate/fixtures", repeat=20)
+def ingest_slate_fixtures():
+    fixture_slate()
+
+
+def _slate_context():
+    return fitted_predictor(), fixture_slate(), get_team_stats()
+
+
+@bench("score/slate/per_game", setup=_slate_context, repeat=5)
+def score_slate_per_game(context):
+    predictor, games, team_stats = context
+    for game in games:
+        predictor.predict_game(
+            team_stats[team_stats.teams[game["home"]]], team_stats[team_stats.teams[game["away"]]]
+        )
+
+
+@bench("score/slate/batched", setup=_slate_context, repeat=20)
+def score_slate_batched(context):
+    predictor, games, team_stats = context
+    predictor.predict_games(games, team_stats)
+
+
+def _season_context():
+    return fitted_predictor(), season_slate(), get_team_stats()
+
+
+@bench("features/season", setup=_season_context, repeat=20)
+def build_season_features(context):
+    _, games, team_stats = context
+    MLBPredictor.build_features(games, team_stats)
+
+
+@bench("score/season/batched", setup=_season_context, repeat=5)
+def score_season_batched(context):
+    predictor, games, team_stats = context
+    predictor.predict_games(games, team_stats)
+
+
+# Every market from one feature pass, next to the run line alone above
+@bench("score/slate/markets", setup=_slate_context, repeat=20)
+def score_slate_markets(context):
+    predictor, games, team_stats = context
+    predictor.predict_markets(games, team_stats)
+
+
+@bench("score/season/markets", setup=_season_context, repeat=5)
+def score_season_markets(context):
+    predictor, games, team_stats = context
+    predictor.predict_markets(games, team_stats)
+
+
+def _cached_season_context():
+    predictor, games, team_stats = _season_context()
+    predictor.cache = PredictionCache()
+    return predictor, games, team_stats
+
+
+def _cache_metrics(context):
+    return {"hit_ratio": context[0].cache.hit_ratio}
+
+
+@bench("score/season/cached", setup=_cached_season_context, repeat=20, metrics=_cache_metrics)
+def score_season_cached(context):
+    predictor, games, team_stats = context
+    predictor.predict_games(games, team_stats)
+
+
+def _peak_bytes(func, *args):
+    """Peak bytes Python-tracked allocations reach during one call"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _unfused_proba(predictor, features):
+    """Scoring as it was before ScoringPipeline: float64 rows, a scaled copy, one pass per member"""
+    features_scaled = predictor.scaler.transform(features)
+    return sum(
+        predictor.weights[name] * getattr(predictor, name).predict_proba(features_scaled)[:, 1]
+        for name in ENSEMBLE_MEMBERS
+    )
+
+
+def _pipeline_context(slate):
+    def setup():
+        predictor, games, team_stats = slate()
+        features = predictor.build_features(games, team_stats)
+        return predictor, features, features.astype(np.float64)
+    return setup
+
+
+def _allocation_metrics(context):
+    predictor, features, features64 = context
+    pipeline = _peak_bytes(predictor.predict_features, features)
+    unfused = _peak_bytes(_unfused_proba, predictor, features64)
+    return {"peak_bytes": pipeline, "unfused_peak_bytes": unfused, "peak_ratio": pipeline / unfused}
+
+
+def _register_pipeline(name, slate, repeat):
+    @bench(f"score/{name}/pipeline", setup=_pipeline_context(slate), repeat=repeat, metrics=_allocation_metrics)
+    def score_pipeline(context):
+        predictor, features, _ = context
+        predictor.predict_features(features)
+
+
+_register_pipeline("slate", _slate_context, 20)
+_register_pipeline("season", _season_context, 5)
+
+
+# Rows scored by the forest alone: one slate, one season
+FOREST_ROWS = [12, SEASON_GAMES]
+
+
+def _register_forest(n_rows):
+    def setup():
+        predictor = fitted_predictor()
+        # Single-threaded, like the compiled traversal
+        forest = predictor.model_rf.set_params(n_jobs=1)
+        X, _ = predictor.generate_training_data(n_rows, seed=1)
+        return forest, compile_forest(forest), X
+
+    @bench(f"forest/sklearn/rows={n_rows}", setup=setup, repeat=20)
+    def forest_sklearn(context):
+        forest, _, X = context
+        forest.predict_proba(X)
+
+    @bench(f"forest/compiled/rows={n_rows}", setup=setup, repeat=20)
+    def forest_compiled(context):
+        _, compiled, X = context
+        compiled.predict_proba(X)
+
+
+for _n_rows in FOREST_ROWS:
+    _register_forest(_n_rows)
+
+
+@bench("forest/compile", setup=lambda: fitted_predictor().model_rf, repeat=5)
+def forest_compile(forest):
+    compile_forest(forest)
+
+
+def _saved_artifact():
+    # Removed with the context once the benchmark is done, or at exit
+    models_dir = tempfile.TemporaryDirectory()
+    predictor = fitted_predictor()
+    predictor.save(models_dir.name)
+    return models_dir, predictor
+
+
+def _artifact_metrics(context):
+    models_dir, predictor = context
+    bundle_dir = os.path.join(models_dir.name, predictor.artifact_version)
+    return {
+        "forest_bytes": os.path.getsize(os.path.join(bundle_dir, "model_rf.joblib")),
+        "compiled_bytes": os.path.getsize(os.path.join(bundle_dir, "model_rf.compiled.joblib")),
+    }
+
+
+@bench("artifact/load", setup=_saved_artifact, repeat=10, metrics=_artifact_metrics)
+def artifact_load(context):
+    load_latest(context[0].name)
+
+
+def _scored_season():
+    games = season_slate()
+    probabilities = np.random.default_rng(1).uniform(0.2, 0.8, len(games))
+    return games, TEAMS, probabilities
+
+
+@bench("post/season/frame", setup=_scored_season, repeat=20)
+def post_season_frame(context):
+    prediction_frame(*context)
+
+
+@bench("post/season/records", setup=_scored_season, repeat=20)
+def post_season_records(context):
+    build_predictions(*context)
+
+
+# One odds refresh: every game of a busy day across many sportsbooks
+QUOTE_EVENTS = 100
+QUOTE_BOOKS = 30
+
+
+def _quotes(seed=0):
+    rng = np.random.default_rng(seed)
+    n = QUOTE_EVENTS * QUOTE_BOOKS
+    events = np.repeat(np.arange(QUOTE_EVENTS), QUOTE_BOOKS)
+    home_price = rng.choice([-125, -120, -115, -110, -105, 100, 105], size=n)
+    return {
+        "event": [f"evt{event}" for event in events],
+        "home": [TEAMS[event % len(TEAMS)] for event in events],
+        "away": [TEAMS[(event + 1) % len(TEAMS)] for event in events],
+        "book": [f"book{book}" for book in np.tile(np.arange(QUOTE_BOOKS), QUOTE_EVENTS)],
+        "point": np.where(events % 2, -1.5, 1.5),
+        "home_price": home_price,
+        "away_price": -home_price - 10,
+    }
+
+
+def _line_history():
+    history = LineHistory()
+    history.record(_quotes(0), "2024-06-01T12:00")
+    return history, _quotes(1)
+
+
+@bench(f"odds/refresh/quotes={QUOTE_EVENTS * QUOTE_BOOKS}", setup=_line_history, repeat=20)
+def odds_refresh(context):
+    history, quotes = context
+    history.market(history.record(quotes, "2024-06-01T12:05"))
+
+
+def _live_odds():
+    """A season-sized slate on the live stream, with one line in ten moving per refresh"""
+    games = season_slate()
+    live = LiveOdds([])
+    live.load(games, TEAMS, np.linspace(0.3, 0.7, len(games)))
+    quotes = {
+        "event": [f"game{i}" for i in range(len(games))],
+        "home": [TEAMS[home] for home in games["home"]],
+        "away": [TEAMS[away] for away in games["away"]],
+        "book": ["book0"] * len(games),
+        "point": games["spread"],
+        "home_price": np.full(len(games), -110),
+        "away_price": np.full(len(games), -110),
+    }
+    live.apply(quotes, "2024-06-01T12:00")
+    return live, quotes, np.arange(len(games)) % 10 == 0
+
+
+@bench(f"odds/live/delta/games={SEASON_GAMES}", setup=_live_odds)
+def live_odds_delta(context):
+    live, quotes, moving = context
+    # Alternate the moving games between -110 and -120
+    quotes["home_price"] = np.where(moving, -230 - quotes["home_price"], quotes["home_price"])
+    live.apply(quotes, "2024-06-01T12:05")
+
+
+# Alternate run lines priced per game alongside the standard one
+ALTERNATE_LINES = [-2.5, -1.5, 1.5, 2.5]
+
+
+def _simulator_slate():
+    rng = np.random.default_rng(0)
+    n_games = 15
+    stats = [rng.normal(4.5, 0.5, n_games) for _ in range(4)]
+    return stats, np.tile(ALTERNATE_LINES, (n_games, 1))
+
+
+@bench(f"simulator/slate/lines={len(ALTERNATE_LINES)}", setup=_simulator_slate, repeat=5)
+def simulate_slate(context):
+    stats, lines = context
+    cover_probability(*stats, lines, seed=0)
+
+
+SYNTHETIC_CHUNK_ROWS = 1_000_000
+
+
+@bench(f"synthetic/chunk/rows={SYNTHETIC_CHUNK_ROWS}", repeat=3)
+def synthetic_chunk_rows():
+    synthetic_chunk(SYNTHETIC_CHUNK_ROWS, chunk_rng(0, 0))
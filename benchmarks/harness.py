@@ -0,0 +1,137 @@
+"""Minimal benchmark registry, runner and result store
+
+Benchmark modules register functions with ``@bench(name)``. A benchmark may
+take a ``setup`` callable whose return value is passed to every timed call,
+so fixtures (fitted models, slates) are built once and not timed, and a
+``metrics`` callable that receives the same value and returns extra numbers
+(e.g. a Brier score) to store next to the timings.
+
+Results are written as JSON with machine metadata and can be compared with a
+previous run to flag regressions.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = []
+
+# Distributions whose versions are recorded with every result file
+TRACKED_PACKAGES = ["numpy", "scikit-learn", "pandas", "joblib", "streamlit"]
+
+
+class Benchmark:
+    def __init__(self, name, func, setup=None, repeat=5, number=1, metrics=None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.repeat = repeat
+        self.number = number
+        self.metrics = metrics
+
+    def run(self):
+        """Per-call seconds for each of ``repeat`` rounds of ``number`` calls, and metrics"""
+        context = self.setup() if self.setup is not None else None
+        args = () if self.setup is None else (context,)
+        self.func(*args)  # warm-up, not recorded
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.func(*args)
+            samples.append((time.perf_counter() - start) / self.number)
+        metrics = self.metrics(*args) if self.metrics is not None else None
+        return samples, metrics
+
+
+def bench(name, setup=None, repeat=5, number=1, metrics=None):
+    """Register the decorated function as benchmark ``name``"""
+    def decorator(func):
+        BENCHMARKS.append(Benchmark(name, func, setup, repeat, number, metrics))
+        return func
+    return decorator
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info():
+    """Where and on what code the benchmarks ran"""
+    packages = {}
+    for name in TRACKED_PACKAGES:
+        try:
+            packages[name] = version(name)
+        except PackageNotFoundError:
+            packages[name] = None
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+    }
+
+
+def summarize(samples):
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "samples": samples,
+    }
+
+
+def run(benchmarks, report=print):
+    """Run benchmarks in order and return the result document"""
+    results = {}
+    for benchmark in benchmarks:
+        samples, metrics = benchmark.run()
+        stats = summarize(samples)
+        line = (f"{benchmark.name:<45} median {stats['median'] * 1000:10.3f} ms"
+                f"  (min {stats['min'] * 1000:.3f} ms, n={len(samples)})")
+        if metrics:
+            stats["metrics"] = metrics
+            line += "  " + ", ".join(f"{key}={value:.4f}" for key, value in metrics.items())
+        results[benchmark.name] = stats
+        report(line)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def save(document, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def compare(document, baseline, threshold=1.25):
+    """(name, baseline median, new median, ratio) for benchmarks slower than ``threshold``x"""
+    regressions = []
+    for name, stats in document["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratio = stats["median"] / old["median"]
+        if ratio > threshold:
+            regressions.append((name, old["median"], stats["median"], ratio))
+    return regressions
@@ -0,0 +1,132 @@
+"""Import-time report and startup budget
+
+Imports each target in a fresh interpreter under ``python -X importtime``,
+prints where the time goes (self time summed per top-level package) and
+fails if a target exceeds its budget or loads a module it must not.
+
+For the app, time spent inside Streamlit's own import tree is reported but
+not charged to the budget: it is the same for any Streamlit app and outside
+our control. Everything imported outside that tree is ours.
+
+    python benchmarks/import_time.py            # report + budget check
+    python benchmarks/import_time.py --runs 9   # more runs, steadier medians
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["sklearn", "joblib", "pandas", "plotly", "requests"]
+
+# name -> (module to import, budget in ms, modules that must not load, trees not charged)
+TARGETS = {
+    "app": ("mlb_predictor_app", 150, ["sklearn", "joblib"], ["streamlit"]),
+    "package": ("mlb_predictor", 20, HEAVY + ["streamlit", "numpy"], []),
+    "scheduler": ("mlb_predictor.scheduler", 60, HEAVY + ["streamlit", "numpy"], []),
+    "cli": ("mlb_predictor.cli", 5000, ["streamlit", "plotly"], []),
+}
+
+
+def parse_importtime(stderr):
+    """Import tree from ``-X importtime`` output, as a list of root nodes
+
+    Each node is ``(module, self_us, cumulative_us, children)``. importtime
+    prints a module after everything it imported, one indent level deeper.
+    """
+    stack = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line.split(":", 1)[1].split("|")
+        depth = len(name) - len(name.lstrip())
+        children = []
+        while stack and stack[-1][0] > depth:
+            children.insert(0, stack.pop()[1])
+        stack.append((depth, (name.strip(), int(self_us), int(cumulative), children)))
+    return [node for _, node in stack]
+
+
+def walk(nodes):
+    for node in nodes:
+        yield node
+        yield from walk(node[3])
+
+
+def measure(module):
+    """Import tree for ``module`` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def charged_ms(roots, module, excluded):
+    """Import time of ``module`` minus the subtrees of ``excluded`` packages inside it"""
+    target = next(node for node in walk(roots) if node[0] == module)
+
+    def excluded_us(node):
+        if node[0].split(".")[0] in excluded:
+            return node[2]
+        return sum(excluded_us(child) for child in node[3])
+
+    return (target[2] - sum(excluded_us(child) for child in target[3])) / 1000
+
+
+def breakdown(roots, top=12):
+    """Self time per top-level package, largest first, in ms"""
+    per_package = defaultdict(int)
+    for name, self_us, _, _ in walk(roots):
+        per_package[name.split(".")[0]] += self_us
+    return sorted(((us / 1000, package) for package, us in per_package.items()), reverse=True)[:top]
+
+
+def run_target(name, runs):
+    module, budget, forbidden, excluded = TARGETS[name]
+    samples = [measure(module) for _ in range(runs)]
+    charged = statistics.median(charged_ms(roots, module, excluded) for roots in samples)
+    loaded = {node[0].split(".")[0] for node in walk(samples[0])}
+    return {
+        "module": module,
+        "charged_ms": charged,
+        "budget_ms": budget,
+        "forbidden_loaded": sorted(loaded & set(forbidden)),
+        "breakdown": breakdown(samples[0]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("targets", nargs="*", help=f"any of {', '.join(TARGETS)}; default all")
+    args = parser.parse_args(argv)
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    failures = []
+    for name in args.targets or TARGETS:
+        report = run_target(name, args.runs)
+        status = "ok"
+        if report["charged_ms"] > report["budget_ms"]:
+            status = "OVER BUDGET"
+            failures.append(name)
+        if report["forbidden_loaded"]:
+            status = f"LOADS {', '.join(report['forbidden_loaded'])}"
+            failures.append(name)
+
+        print(f"{name} (import {report['module']}): {report['charged_ms']:.0f} ms "
+              f"of {report['budget_ms']} ms budget [{status}]")
+        for ms, package in report["breakdown"]:
+            print(f"    {ms:8.1f} ms  {package}")
+
+    if failures:
+        sys.exit(f"Import-time budget failed for: {', '.join(dict.fromkeys(failures))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Run the benchmark suite and store the results as JSON
+
+    python benchmarks/run.py                          # everything
+    python benchmarks/run.py -k score                 # names containing "score"
+    python benchmarks/run.py --compare baseline.json  # fail on >25% slowdowns
+
+Results go to benchmarks/results/<commit>-<timestamp>.json unless --output is
+given. Import-time budgets are checked separately by import_time.py.
+"""
+import argparse
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import harness  # noqa: E402
+
+MODULES = ["bench_predictor", "bench_members", "bench_app"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    for module in MODULES:
+        __import__(module)
+    selected = [b for b in harness.BENCHMARKS if not args.pattern or args.pattern in b.name]
+
+    document = harness.run(selected)
+    machine = document["machine"]
+    output = args.output or os.path.join(
+        BENCH_DIR, "results",
+        f"{(machine['commit'] or 'nogit')[:10]}-{document['created_at'].replace(':', '')}.json",
+    )
+    harness.save(document, output)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["machine"].get("platform") != machine["platform"]:
+            print("warning: baseline was recorded on a different platform")
+        regressions = harness.compare(document, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old * 1000:.3f} ms -> {new * 1000:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""MLB spread prediction models, usable with or without the Streamlit app
+
+Names are re-exported lazily so importing the package (or a light submodule
+such as ``mlb_predictor.scheduler``) does not pull in scikit-learn, pandas or
+requests until something actually uses them.
+"""
+import importlib
+
+_EXPORTS = {
+    "mlb_predictor.model": [
+        "FEATURE_NAMES", "MLBPredictor", "data_version", "latest_artifact_version", "load_latest",
+    ],
+    "mlb_predictor.data": ["get_team_stats", "get_todays_games"],
+    "mlb_predictor.features": ["TeamFeatureStore", "build_training_set"],
+    "mlb_predictor.recommendations": [
+        "IMPLIED_PROB", "build_predictions", "edge", "prediction_frame", "recommend",
+    ],
+    "mlb_predictor.tables": ["MARKETS", "TEAMS", "TeamTable", "make_slate", "team_index"],
+}
+_MODULE_FOR = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_FOR)
+
+
+def __getattr__(name):
+    if name not in _MODULE_FOR:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_MODULE_FOR[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,3 @@
+from mlb_predictor.cli import main
+
+main()
@@ -0,0 +1,170 @@
+"""Walk-forward historical backtests of the MLBPredictor ensemble
+
+A season is a list of game dicts with ``date``, ``home``, ``away``, ``spread``
+(the home run line at close, e.g. -1.5), ``home_score`` and ``away_score``,
+and optionally ``price`` (American odds on the home side at close; -110 is
+assumed where missing).
+Games are replayed one day at a time: each day's slate is scored in one batch
+with models trained only on earlier games, then its results are ingested into
+a TeamFeatureStore and appended to the training history.
+
+    python -m mlb_predictor.backtest 2022.csv 2023.csv --workers 2
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
+
+import numpy as np
+import pandas as pd
+
+from mlb_predictor.features import TeamFeatureStore, as_date, home_covered
+from mlb_predictor.members import MEMBERS
+from mlb_predictor.model import FEATURE_NAMES, MLBPredictor, default_train_jobs
+from mlb_predictor.odds import american_to_decimal
+from mlb_predictor.pipeline import FEATURE_DTYPE
+from mlb_predictor.recommendations import TIERS, PASS_TIER, break_even, edge, recommend
+from mlb_predictor.tables import make_slate, team_index
+
+# Profit in units for a winning bet at -110, the price assumed when a game has none
+WIN_PAYOUT = 100 / 110
+
+
+def run_backtest(games, retrain_every=7, min_train_games=150, train_window=None,
+                 predictor_factory=MLBPredictor, incremental=False):
+    """Replay one season day by day and return a DataFrame with a row per scored game
+
+    The models are refit every ``retrain_every`` days once ``min_train_games``
+    results are available, on the last ``train_window`` games (all if None).
+    With ``incremental``, later retrains fold in only the games since the
+    previous one, with periodic full refits (see MLBPredictor.retrain).
+    Games played before the first fit are not scored.
+    """
+    games = sorted(games, key=lambda game: as_date(game["date"]))
+    teams = team_index(games)
+    slate = make_slate(games, teams)
+    covered = np.array([home_covered(game) for game in games])
+
+    # Preallocated history so each retrain slices instead of rebuilding arrays
+    X_hist = np.empty((len(games), len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+
+    store = TeamFeatureStore()
+    predictor = None
+    last_trained = None
+    trained_end = 0
+    scored = np.zeros(len(games), dtype=bool)
+    confidences = np.empty(len(games))
+
+    start = 0
+    for day, day_games in groupby(games, key=lambda game: as_date(game["date"])):
+        day_games = list(day_games)
+        end = start + len(day_games)
+        X_hist[start:end] = MLBPredictor.build_features(
+            slate[start:end], store.team_table(as_of=day, teams=teams)
+        )
+
+        if predictor is not None:
+            confidences[start:end] = predictor.predict_features(X_hist[start:end], slate["spread"][start:end]) * 100
+            scored[start:end] = True
+
+        store.ingest_many(day_games)
+        start = end
+
+        due = last_trained is None or (day - last_trained).days >= retrain_every
+        if due and end >= min_train_games:
+            first = 0 if train_window is None else max(0, end - train_window)
+            if incremental and predictor is not None:
+                predictor.retrain(X_hist[first:end], covered[first:end], end - trained_end)
+            else:
+                predictor = predictor_factory().fit(X_hist[first:end], covered[first:end])
+            last_trained = day
+            trained_end = end
+
+    games = [game for game, game_scored in zip(games, scored) if game_scored]
+    confidences = confidences[scored]
+    return pd.DataFrame({
+        "date": [as_date(game["date"]) for game in games],
+        "home": [game["home"] for game in games],
+        "away": [game["away"] for game in games],
+        "spread": [game["spread"] for game in games],
+        "price": slate["price"][scored],
+        "confidence": confidences,
+        "edge": edge(confidences, break_even(slate["price"][scored])),
+        "recommendation": recommend(confidences)[0],
+        "covered": covered[scored],
+    })
+
+
+def _run_season(args):
+    season, games, kwargs = args
+    results = run_backtest(games, **kwargs)
+    results.insert(0, "season", season)
+    return results
+
+
+def run_seasons(seasons, workers=None, **kwargs):
+    """Backtest several independent seasons, in a process pool if workers > 1
+
+    ``seasons`` maps a season label to its games; keyword arguments are passed
+    to run_backtest().
+    """
+    jobs = [(season, games, kwargs) for season, games in seasons.items()]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_season, jobs))
+    else:
+        results = [_run_season(job) for job in jobs]
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize(results):
+    """Bets, hit rate and units won at each game's price (-110 if unknown) per recommendation tier"""
+    tiers = [name for _, name, _ in TIERS] + [PASS_TIER[0]]
+    price = results["price"].to_numpy() if "price" in results else np.full(len(results), np.nan)
+    payout = np.where(np.isnan(price), WIN_PAYOUT, american_to_decimal(np.nan_to_num(price, nan=-110)) - 1)
+    profit = pd.Series(np.where(results["covered"], payout, -1.0), index=results.index)
+
+    grouped = results.groupby("recommendation")["covered"]
+    summary = pd.DataFrame({"bets": grouped.size(), "hit_rate": grouped.mean()}).reindex(tiers)
+    summary["units"] = profit.groupby(results["recommendation"]).sum().reindex(tiers)
+    return summary.fillna(0)
+
+
+def load_season(path):
+    """Read one season of games from a CSV with the columns run_backtest expects"""
+    return pd.read_csv(path).to_dict("records")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the MLB prediction models")
+    parser.add_argument("seasons", nargs="+", help="CSV file per season")
+    parser.add_argument("--retrain-every", type=int, default=7, help="days between refits")
+    parser.add_argument("--min-train-games", type=int, default=150)
+    parser.add_argument("--train-window", type=int, default=None, help="most recent games to train on")
+    parser.add_argument("--workers", type=int, default=None, help="processes, one season each")
+    parser.add_argument("--svm-member", choices=sorted(MEMBERS), help="estimator for the SVM slot")
+    parser.add_argument("--jobs", type=int, default=default_train_jobs(),
+                        help="training cores in total, shared between season workers")
+    parser.add_argument("--incremental", action="store_true",
+                        help="update the models with new games between periodic full refits")
+    parser.add_argument("--output", help="write per-game results to this CSV")
+    args = parser.parse_args(argv)
+
+    results = run_seasons(
+        {path: load_season(path) for path in args.seasons},
+        workers=args.workers,
+        retrain_every=args.retrain_every,
+        min_train_games=args.min_train_games,
+        train_window=args.train_window,
+        incremental=args.incremental,
+        predictor_factory=partial(
+            MLBPredictor, svm_member=args.svm_member, n_jobs=max(1, args.jobs // (args.workers or 1))
+        ),
+    )
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(summarize(results).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Headless entry point: ``python -m mlb_predictor <command> [options]``
+
+    predict   score one date or a date range with the latest model artifact
+    train     fit the models and publish an artifact (see mlb_predictor.train)
+    backtest  walk-forward backtest of past seasons (see mlb_predictor.backtest)
+    tune      search hyperparameters and ensemble weights (see mlb_predictor.tune)
+    synthetic write a large synthetic training set as shards (see mlb_predictor.synthetic)
+
+Nothing here imports Streamlit or Plotly, so it is cheap to run from cron.
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from mlb_predictor import backtest, synthetic, train, tune
+from mlb_predictor.data import get_team_stats, get_todays_games
+from mlb_predictor.ingest import FixtureSource, odds_api_source, statsapi_source
+from mlb_predictor.model import load_latest
+from mlb_predictor.recommendations import prediction_frame
+
+FORMATS = ["json", "csv", "parquet"]
+
+
+def _date_range(start, end):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def predict_frame(predictor, days, schedule_source=None, odds_source=None, min_confidence=None):
+    """Predictions in every market for each game on ``days`` as one DataFrame, scored in one batch"""
+    team_stats = get_team_stats()
+    slates = [get_todays_games(schedule_source, odds_source, day) for day in days]
+    markets = predictor.predict_markets(np.concatenate(slates), team_stats)
+
+    frames = []
+    offset = 0
+    for day, slate in zip(days, slates):
+        day_markets = {market: values[offset:offset + len(slate)] for market, values in markets.items()}
+        offset += len(slate)
+        frame = prediction_frame(slate, team_stats.teams, day_markets, min_confidence)
+        frames.append(frame.assign(date=day.isoformat()))
+    columns = [
+        "date", "matchup", "spread", "price", "time", "confidence", "edge", "recommendation",
+        "home_win", "total", "over",
+    ]
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def predict_main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mlb_predictor predict",
+                                     description="Write predictions for a date or date range")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(),
+                        help="first (or only) date, YYYY-MM-DD; default today")
+    parser.add_argument("--end-date", type=date.fromisoformat,
+                        help="last date of a range, inclusive; needs --fixtures or --live")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--output", help="output file; default stdout (json/csv only)")
+    parser.add_argument("--models-dir", default="models")
+    parser.add_argument("--min-confidence", type=float, help="leave out games below this confidence %%")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="replay recorded schedule/odds responses from this directory")
+    source.add_argument("--live", action="store_true", help="fetch from the Stats API and The Odds API")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet needs --output")
+    if args.end_date and args.end_date < args.date:
+        parser.error("--end-date is before --date")
+    if args.end_date and args.end_date != args.date and not (args.fixtures or args.live):
+        parser.error("a date range needs --fixtures or --live; the built-in demo slate is the same every day")
+
+    predictor = load_latest(args.models_dir)
+    if predictor is None:
+        parser.exit(1, f"No model artifact in {args.models_dir}; run `python -m mlb_predictor train` first\n")
+
+    schedule_source = odds_source = None
+    if args.fixtures:
+        schedule_source = odds_source = FixtureSource(args.fixtures)
+    elif args.live:
+        schedule_source, odds_source = statsapi_source(), odds_api_source()
+
+    days = _date_range(args.date, args.end_date or args.date)
+    frame = predict_frame(predictor, days, schedule_source, odds_source, args.min_confidence)
+
+    output = args.output or sys.stdout
+    if args.format == "json":
+        frame.to_json(output, orient="records", indent=1)
+    elif args.format == "csv":
+        frame.to_csv(output, index=False)
+    else:
+        frame.to_parquet(output, index=False)
+
+
+COMMANDS = {
+    "predict": predict_main,
+    "train": train.main,
+    "backtest": backtest.main,
+    "tune": tune.main,
+    "synthetic": synthetic.main,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        sys.exit(__doc__)
+    COMMANDS[argv[0]](argv[1:])
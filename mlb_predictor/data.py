@@ -0,0 +1,67 @@
+"""Slate and team-stat sources for the predictor"""
+from datetime import date
+
+from mlb_predictor.tables import TeamTable, make_slate
+
+
+def get_todays_games(schedule_source=None, odds_source=None, day=None):
+    """Get today's MLB games as a structured slate array
+
+    With ingestion sources (see mlb_predictor.ingest) the slate for ``day``
+    (default today) comes from their schedule and odds; otherwise the demo slate.
+    """
+    if schedule_source is not None:
+        # Deferred so the demo path never imports requests
+        from mlb_predictor.ingest import fetch_slate
+
+        return fetch_slate(day or date.today(), schedule_source, odds_source or schedule_source)
+
+    games = [
+        {"home": "LAD", "away": "NYM", "spread": -1.5, "time": "10:10 PM", "total": 8.5},
+        {"home": "TOR", "away": "PHI", "spread": 1.5, "time": "7:07 PM", "total": 9.0},
+        {"home": "PIT", "away": "HOU", "spread": 1.5, "time": "7:05 PM", "total": 8.0},
+        {"home": "SF", "away": "SD", "spread": -1.5, "time": "10:15 PM", "total": 7.5},
+        {"home": "STL", "away": "KC", "spread": -1.5, "time": "8:15 PM", "total": 9.5},
+        {"home": "NYY", "away": "BOS", "spread": -1.5, "time": "7:05 PM", "total": 10.0},
+        {"home": "CHC", "away": "MIL", "spread": 1.5, "time": "8:05 PM", "total": 8.5},
+        {"home": "TEX", "away": "SEA", "spread": -1.5, "time": "8:05 PM", "total": 9.0},
+        {"home": "ATL", "away": "WSH", "spread": -1.5, "time": "7:20 PM", "total": 8.0},
+        {"home": "CLE", "away": "DET", "spread": -1.5, "time": "7:10 PM", "total": 7.5},
+        {"home": "OAK", "away": "MIN", "spread": 1.5, "time": "10:07 PM", "total": 8.0},
+        {"home": "TB", "away": "BAL", "spread": 1.5, "time": "7:10 PM", "total": 8.5}
+    ]
+    return make_slate(games)
+
+
+def get_team_stats(store=None, as_of=None):
+    """Get team statistics as a TeamTable, from a results feature store when one is given"""
+    if store is not None:
+        return store.team_table(as_of)
+
+    teams = {
+        "LAD": {"win_pct": 0.62, "runs_per_game": 5.1, "era": 3.45},
+        "NYM": {"win_pct": 0.55, "runs_per_game": 4.8, "era": 3.89},
+        "TOR": {"win_pct": 0.48, "runs_per_game": 4.6, "era": 4.12},
+        "PHI": {"win_pct": 0.58, "runs_per_game": 5.0, "era": 3.76},
+        "PIT": {"win_pct": 0.45, "runs_per_game": 4.2, "era": 4.34},
+        "HOU": {"win_pct": 0.61, "runs_per_game": 5.2, "era": 3.67},
+        "SF": {"win_pct": 0.52, "runs_per_game": 4.7, "era": 3.98},
+        "SD": {"win_pct": 0.49, "runs_per_game": 4.5, "era": 4.05},
+        "STL": {"win_pct": 0.53, "runs_per_game": 4.8, "era": 4.01},
+        "KC": {"win_pct": 0.47, "runs_per_game": 4.4, "era": 4.18},
+        "NYY": {"win_pct": 0.59, "runs_per_game": 5.3, "era": 3.55},
+        "BOS": {"win_pct": 0.51, "runs_per_game": 4.9, "era": 4.08},
+        "CHC": {"win_pct": 0.46, "runs_per_game": 4.3, "era": 4.25},
+        "MIL": {"win_pct": 0.54, "runs_per_game": 4.9, "era": 3.82},
+        "TEX": {"win_pct": 0.56, "runs_per_game": 5.0, "era": 3.94},
+        "SEA": {"win_pct": 0.50, "runs_per_game": 4.6, "era": 4.15},
+        "ATL": {"win_pct": 0.60, "runs_per_game": 5.1, "era": 3.59},
+        "WSH": {"win_pct": 0.44, "runs_per_game": 4.1, "era": 4.41},
+        "CLE": {"win_pct": 0.57, "runs_per_game": 4.8, "era": 3.71},
+        "DET": {"win_pct": 0.43, "runs_per_game": 4.0, "era": 4.52},
+        "OAK": {"win_pct": 0.41, "runs_per_game": 3.9, "era": 4.68},
+        "MIN": {"win_pct": 0.49, "runs_per_game": 4.5, "era": 4.21},
+        "TB": {"win_pct": 0.52, "runs_per_game": 4.7, "era": 3.91},
+        "BAL": {"win_pct": 0.54, "runs_per_game": 4.8, "era": 3.85}
+    }
+    return TeamTable.from_dict(teams)
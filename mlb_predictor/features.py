@@ -0,0 +1,153 @@
+"""Team stats derived incrementally from game results
+
+Results are ingested one game at a time, in date order. Each team keeps a
+cumulative history per season, so ingesting is O(1) and any season or rolling
+aggregate "as of" a date is a binary search plus a subtraction, which keeps
+training sets free of look-ahead leakage.
+"""
+from bisect import bisect_left
+from datetime import date, datetime
+
+import numpy as np
+
+from mlb_predictor.model import FEATURE_NAMES, MLBPredictor
+from mlb_predictor.pipeline import FEATURE_DTYPE
+from mlb_predictor.tables import DEFAULT_TEAM_STATS, TEAM_STATS, TeamTable, team_index
+
+# Rolling "recent form" stats, over the last DEFAULT_WINDOW games by default
+RECENT_STATS = ["recent_win_pct", "recent_runs_per_game", "recent_era"]
+DEFAULT_WINDOW = 10
+
+
+def as_date(value):
+    """Normalize a date, datetime or ISO string to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def home_covered(game):
+    """Whether the home team covered its run line (.5 lines, so no pushes)"""
+    return game["home_score"] - game["away_score"] + game["spread"] > 0
+
+
+def _default_stats():
+    stats = dict(DEFAULT_TEAM_STATS)
+    stats.update({f"recent_{name}": value for name, value in DEFAULT_TEAM_STATS.items()})
+    stats["games"] = 0
+    return stats
+
+
+def _rates(games, wins, scored, allowed):
+    # Runs allowed per game stands in for ERA; box scores carry no earned runs
+    return wins / games, scored / games, allowed / games
+
+
+class _TeamSeason:
+    """Dates played and running totals after each game, with a zero row first"""
+    __slots__ = ("dates", "totals")
+
+    def __init__(self):
+        self.dates = []
+        # Cumulative (games, wins, runs scored, runs allowed)
+        self.totals = [(0, 0, 0, 0)]
+
+
+class TeamFeatureStore:
+    """Season and rolling team aggregates, maintained one result at a time"""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._seasons = {}
+        self._latest = {}
+
+    def ingest(self, game):
+        """Add one final score; games must arrive in date order per team"""
+        day = as_date(game["date"])
+        home_won = game["home_score"] > game["away_score"]
+        for team, scored, allowed, won in (
+            (game["home"], game["home_score"], game["away_score"], home_won),
+            (game["away"], game["away_score"], game["home_score"], not home_won),
+        ):
+            season = self._seasons.setdefault((team, day.year), _TeamSeason())
+            if season.dates and day < season.dates[-1]:
+                raise ValueError(f"{team} result for {day} arrived after {season.dates[-1]}")
+            games, wins, total_scored, total_allowed = season.totals[-1]
+            season.dates.append(day)
+            season.totals.append((games + 1, wins + won, total_scored + scored, total_allowed + allowed))
+            self._latest[team] = max(self._latest.get(team, day), day)
+
+    def ingest_many(self, games):
+        """Ingest a sequence of results in order"""
+        for game in games:
+            self.ingest(game)
+
+    def stats(self, team, as_of=None):
+        """Season-to-date and recent-form stats from games before ``as_of``
+
+        Without ``as_of`` this is the team's state after every ingested game.
+        """
+        if as_of is None:
+            if team not in self._latest:
+                return _default_stats()
+            year = self._latest[team].year
+        else:
+            as_of = as_date(as_of)
+            year = as_of.year
+
+        season = self._seasons.get((team, year))
+        if season is None:
+            return _default_stats()
+
+        n = len(season.dates) if as_of is None else bisect_left(season.dates, as_of)
+        if n == 0:
+            return _default_stats()
+
+        totals = season.totals[n]
+        window_start = season.totals[max(0, n - self.window)]
+        win_pct, runs_per_game, era = _rates(*totals)
+        recent_win_pct, recent_runs_per_game, recent_era = _rates(
+            *(total - start for total, start in zip(totals, window_start))
+        )
+        return {
+            "win_pct": win_pct,
+            "runs_per_game": runs_per_game,
+            "era": era,
+            "recent_win_pct": recent_win_pct,
+            "recent_runs_per_game": recent_runs_per_game,
+            "recent_era": recent_era,
+            "games": totals[0],
+        }
+
+    def team_table(self, as_of=None, teams=None):
+        """Stats for every team as a TeamTable, indexed by ``teams`` (default: all seen)"""
+        if teams is None:
+            teams = team_index([{"home": team, "away": team} for team in self._latest])
+        columns = TEAM_STATS + RECENT_STATS
+        values = np.empty((len(teams), len(columns)))
+        for i, team in enumerate(teams):
+            stats = self.stats(team, as_of)
+            values[i] = [stats[name] for name in columns]
+        return TeamTable(teams, columns, values)
+
+
+def build_training_set(games, store=None):
+    """Leakage-free features and home-cover labels for completed games
+
+    Each game is featurized from the stats before its date, then ingested.
+    Games are processed in date order; the filled store is returned too.
+    """
+    store = store if store is not None else TeamFeatureStore()
+    games = sorted(games, key=lambda game: as_date(game["date"]))
+    features = np.empty((len(games), len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+    targets = np.empty(len(games), dtype=int)
+    for i, game in enumerate(games):
+        day = game["date"]
+        features[i] = MLBPredictor.feature_row(
+            store.stats(game["home"], as_of=day), store.stats(game["away"], as_of=day)
+        )
+        targets[i] = home_covered(game)
+        store.ingest(game)
+    return features, targets, store
@@ -0,0 +1,148 @@
+"""Fitted random forests compiled to flat arrays for scoring
+
+``compile_forest`` concatenates the nodes of every tree into a handful of
+contiguous arrays: split feature, threshold, child pair and, per node, class
+probabilities. ``CompiledForest.predict_proba`` walks every row down every
+tree at once, one NumPy step per level, so a 12-game slate costs a few
+dozen vectorized operations instead of a parallel job per tree.
+
+Results are bit-identical to the source forest's ``predict_proba`` (scored
+single-threaded: with several threads sklearn adds the trees up in whatever
+order they finish). Rows are compared in float32, as sklearn does, which
+lets thresholds be stored in float32 too: a float32 value is at most a
+float64 threshold exactly when it is at most that threshold rounded down to
+float32. Leaves point to themselves, so rows that reach one early just stay
+there while deeper rows finish.
+"""
+import numpy as np
+
+THRESHOLD_DTYPE = np.float32
+# Rows walked through the trees at a time: keeps the per-level arrays in cache
+SCORE_ROWS = 256
+
+
+def compilable(estimator):
+    """True for fitted single-output forests of decision trees (RandomForest, ExtraTrees)"""
+    trees = getattr(estimator, "estimators_", None)
+    return (
+        bool(trees)
+        and getattr(estimator, "n_outputs_", None) == 1
+        and all(hasattr(tree, "tree_") for tree in trees)
+    )
+
+
+def _round_down(threshold):
+    """Largest float32 at most each float64 threshold"""
+    rounded = threshold.astype(THRESHOLD_DTYPE)
+    above = rounded > threshold
+    rounded[above] = np.nextafter(rounded[above], THRESHOLD_DTYPE(-np.inf))
+    return rounded
+
+
+def _stores_counts():
+    """True when trees store weighted class counts per node, as before scikit-learn 1.4
+
+    From 1.4 on they store class fractions, which predict_proba returns as is.
+    """
+    import sklearn
+    from sklearn.utils.fixes import parse_version
+
+    return parse_version(sklearn.__version__).release < (1, 4)
+
+
+def compile_forest(forest):
+    """CompiledForest scoring exactly like a fitted forest's ``predict_proba``"""
+    if not compilable(forest):
+        raise ValueError(f"Cannot compile {type(forest).__name__}: not a fitted single-output tree forest")
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    offsets = np.concatenate([[0], np.cumsum([tree.node_count for tree in trees])])
+    if offsets[-1] > np.iinfo(np.int32).max // 2:
+        raise ValueError(f"Forest too large to compile: {offsets[-1]} nodes")
+
+    n_classes = len(forest.classes_)
+    counts = _stores_counts()
+    feature_dtype = np.int16 if forest.n_features_in_ <= np.iinfo(np.int16).max else np.int32
+    feature = np.empty(offsets[-1], dtype=feature_dtype)
+    threshold = np.empty(offsets[-1], dtype=THRESHOLD_DTYPE)
+    children = np.empty((offsets[-1], 2), dtype=np.int32)
+    missing_left = np.empty(offsets[-1], dtype=bool)
+    value = np.empty((offsets[-1], n_classes))
+    for tree, start, stop in zip(trees, offsets[:-1], offsets[1:]):
+        nodes = np.arange(start, stop)
+        leaf = tree.children_left == -1
+        feature[start:stop] = np.where(leaf, 0, tree.feature)
+        threshold[start:stop] = _round_down(tree.threshold)
+        children[start:stop, 0] = np.where(leaf, nodes, tree.children_left + start)
+        children[start:stop, 1] = np.where(leaf, nodes, tree.children_right + start)
+        missing_left[start:stop] = tree.missing_go_to_left.astype(bool)
+        value[start:stop] = tree.value[:, 0, :n_classes]
+        if counts:
+            # Divided exactly as the tree's predict_proba does, empty nodes by 1
+            normalizer = value[start:stop].sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value[start:stop] /= normalizer
+
+    return CompiledForest(
+        feature, threshold, children.ravel(), missing_left, value,
+        roots=offsets[:-1].astype(np.int32),
+        depth=max(tree.max_depth for tree in trees),
+        classes=forest.classes_,
+        n_features=forest.n_features_in_,
+    )
+
+
+class CompiledForest:
+    """Flat-array forest with the ``predict_proba`` / ``predict`` interface of its source"""
+
+    def __init__(self, feature, threshold, children, missing_left, value, roots, depth, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        # Left and right child of node i at 2 * i and 2 * i + 1
+        self.children = children
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in (
+            self.feature, self.threshold, self.children, self.missing_left, self.value, self.roots,
+        ))
+
+    def apply(self, X):
+        """Leaf reached by each row in each tree, shape (trees, rows), as global node indices"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected rows of {self.n_features_in_} features, got shape {X.shape}")
+        values = X.ravel()
+        has_missing = bool(np.isnan(values).any())
+        # Offset of each row's first feature in ``values``
+        row_starts = np.arange(0, values.size, X.shape[1], dtype=np.intp)
+        nodes = np.repeat(self.roots.astype(np.intp)[:, None], len(X), axis=1)
+        for _ in range(self.depth):
+            x = values.take(row_starts + self.feature.take(nodes))
+            # NaN compares false: it goes right unless the node sends missing values left
+            go_right = ~(x <= self.threshold.take(nodes))
+            if has_missing:
+                go_right &= ~(np.isnan(x) & self.missing_left.take(nodes))
+            nodes = self.children.take(2 * nodes + go_right)
+        return nodes
+
+    def predict_proba(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        probabilities = np.empty((len(X), self.value.shape[1]))
+        for start in range(0, len(X), SCORE_ROWS):
+            # Trees are summed in order from zero, then averaged, exactly as sklearn does
+            chunk = np.add.reduce(self.value[self.apply(X[start:start + SCORE_ROWS])], axis=0)
+            probabilities[start:start + SCORE_ROWS] = chunk / len(self.roots)
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,91 @@
+"""Incremental and out-of-core training helpers for MLBPredictor
+
+Updating the scaler with ``partial_fit`` moves the scaled feature space under
+members that are already fitted. Standard scaling is a per-feature affine map,
+so for trees (split thresholds) and linear models (coefficients) the move can
+be undone exactly with ``rescale_member``; other members are refit on recent
+rows instead.
+
+Forests are refreshed by growing a few trees on recent rows with
+``warm_start`` and retiring the same number of the oldest trees, so the
+forest keeps its size and its memory fades over successive updates.
+
+Out-of-core training builds a forest the same way from batches it never
+holds together: ``forest_schedule`` spreads the trees over the batches and
+``add_trees`` grows each batch's share.
+"""
+import numpy as np
+
+# Node value sklearn trees use for the missing child of a leaf
+TREE_LEAF = -1
+
+
+def scaler_state(scaler):
+    """Copy of the affine parameters of a fitted StandardScaler"""
+    return scaler.mean_.copy(), scaler.scale_.copy()
+
+
+def rescale_member(estimator, old, new):
+    """Rewrite a fitted member for inputs scaled by ``new`` instead of ``old``
+
+    ``old`` and ``new`` are ``(mean, scale)`` pairs from scaler_state(). The
+    member's predictions on the same raw rows are unchanged. Returns False
+    for estimators this cannot be done for.
+    """
+    old_mean, old_scale = old
+    new_mean, new_scale = new
+    if hasattr(estimator, "estimators_") and hasattr(estimator.estimators_[0], "tree_"):
+        for tree in estimator.estimators_:
+            # Writable views into the tree's node array
+            nodes = tree.tree_
+            split = nodes.children_left != TREE_LEAF
+            feature = nodes.feature[split]
+            nodes.threshold[split] = (
+                nodes.threshold[split] * old_scale[feature] + old_mean[feature] - new_mean[feature]
+            ) / new_scale[feature]
+        return True
+    if hasattr(estimator, "coef_") and hasattr(estimator, "partial_fit"):
+        ratio = new_scale / old_scale
+        # Keep the member's own dtype: SGD trained on float32 rows has float32 weights
+        # and its next partial_fit rejects float64 ones
+        intercept = estimator.intercept_ + estimator.coef_ @ ((new_mean - old_mean) / old_scale)
+        estimator.intercept_ = intercept.astype(estimator.intercept_.dtype, copy=False)
+        estimator.coef_ = (estimator.coef_ * ratio).astype(estimator.coef_.dtype, copy=False)
+        return True
+    return False
+
+
+def grow_forest(forest, X, y, n_trees):
+    """Add ``n_trees`` trees fitted on ``X`` and drop the ``n_trees`` oldest ones
+
+    Works on a copy of the estimator list, so earlier references to the
+    forest's trees are left alone.
+    """
+    size = len(forest.estimators_)
+    forest.estimators_ = list(forest.estimators_)
+    forest.set_params(warm_start=True, n_estimators=size + n_trees)
+    forest.fit(X, y)
+    forest.estimators_ = forest.estimators_[n_trees:]
+    forest.set_params(warm_start=False, n_estimators=size)
+    return forest
+
+
+def forest_schedule(n_trees, n_batches):
+    """Trees to grow on each of ``n_batches`` batches: ``n_trees`` spread evenly, in order"""
+    positions = np.arange(n_trees) * n_batches // n_trees
+    return np.bincount(positions, minlength=n_batches)
+
+
+def add_trees(forest, X, y, n_trees):
+    """Grow ``n_trees`` more trees on ``X`` (the first ones if the forest is unfitted)"""
+    size = len(getattr(forest, "estimators_", []))
+    forest.set_params(warm_start=True, n_estimators=size + n_trees)
+    forest.fit(X, y)
+    forest.set_params(warm_start=False)
+    return forest
+
+
+def partial_fit_member(estimator, X, y):
+    """Fold new rows into a streaming member"""
+    estimator.partial_fit(X, y, classes=np.array([0, 1]))
+    return estimator
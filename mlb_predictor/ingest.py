@@ -0,0 +1,366 @@
+"""Schedule and odds ingestion with an on-disk response cache
+
+Every source exposes ``fetch(endpoint, params)`` and returns decoded JSON:
+
+* ``HTTPSource`` calls a live API over a pooled ``requests`` session. Responses
+  are kept in a ``ResponseCache`` on disk, served without a request while
+  younger than the endpoint's TTL, and revalidated with ETag /
+  If-Modified-Since once stale.
+* ``FixtureSource`` replays responses recorded with ``RecordingSource`` from a
+  directory, so the whole pipeline runs offline.
+* ``ReplaySource`` plays back a recorded sequence of responses, one per
+  fetch, standing in for a live odds feed (see ``mlb_predictor.live``).
+
+``fetch_slate()`` turns a schedule and odds payload into a slate priced at the
+best available run-line odds (see ``mlb_predictor.odds``), with the
+consensus total line where one is quoted.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from mlb_predictor.odds import LineHistory, lower_median
+from mlb_predictor.tables import make_slate
+
+STATSAPI_URL = "https://statsapi.mlb.com/api/v1"
+ODDS_API_URL = "https://api.the-odds-api.com/v4"
+
+# Seconds a cached response is served without contacting the API
+DEFAULT_TTLS = {
+    "schedule": 6 * 60 * 60,
+    "odds": 5 * 60,
+}
+
+ODDS_PARAMS = {"regions": "us", "markets": "spreads,totals", "oddsFormat": "american"}
+
+DISPLAY_TZ = ZoneInfo("America/New_York")
+
+# Full names used by odds feeds, by abbreviation
+TEAM_NAMES = {
+    "ARI": "Arizona Diamondbacks", "ATL": "Atlanta Braves", "BAL": "Baltimore Orioles",
+    "BOS": "Boston Red Sox", "CHC": "Chicago Cubs", "CWS": "Chicago White Sox",
+    "CIN": "Cincinnati Reds", "CLE": "Cleveland Guardians", "COL": "Colorado Rockies",
+    "DET": "Detroit Tigers", "HOU": "Houston Astros", "KC": "Kansas City Royals",
+    "LAA": "Los Angeles Angels", "LAD": "Los Angeles Dodgers", "MIA": "Miami Marlins",
+    "MIL": "Milwaukee Brewers", "MIN": "Minnesota Twins", "NYM": "New York Mets",
+    "NYY": "New York Yankees", "OAK": "Oakland Athletics", "PHI": "Philadelphia Phillies",
+    "PIT": "Pittsburgh Pirates", "SD": "San Diego Padres", "SEA": "Seattle Mariners",
+    "SF": "San Francisco Giants", "STL": "St. Louis Cardinals", "TB": "Tampa Bay Rays",
+    "TEX": "Texas Rangers", "TOR": "Toronto Blue Jays", "WSH": "Washington Nationals",
+}
+TEAM_ABBREVIATIONS = {name: abbreviation for abbreviation, name in TEAM_NAMES.items()}
+TEAM_ABBREVIATIONS["Athletics"] = "OAK"
+
+# Stats API abbreviations that differ from the ones used here
+STATSAPI_ABBREVIATIONS = {"AZ": "ARI", "ATH": "OAK"}
+
+
+def make_session(pool_size=10, retries=3):
+    """requests session with a connection pool and retry on transient errors"""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fixture_name(endpoint, params=None):
+    """Stable, readable file name for one endpoint + params combination"""
+    parts = [endpoint] + [f"{key}={value}" for key, value in sorted((params or {}).items())]
+    return re.sub(r"[^A-Za-z0-9_.=,-]", "_", "__".join(parts)) + ".json"
+
+
+class ResponseCache:
+    """Decoded responses and their validators, one JSON file per request"""
+
+    def __init__(self, directory=".cache/http"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key):
+        """Cached entry for key, or None"""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, entry):
+        """Store an entry, replacing the file atomically"""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+
+class Source:
+    """Anything that can return decoded JSON for an endpoint and params"""
+
+    def fetch(self, endpoint, params=None):
+        raise NotImplementedError
+
+
+class HTTPSource(Source):
+    """Live API source with per-endpoint TTLs and conditional revalidation
+
+    ``endpoints`` maps endpoint names to URL paths under ``base_url``.
+    ``default_params`` (e.g. API keys) are sent with every request but kept
+    out of cache keys and fixture names.
+    """
+
+    def __init__(self, base_url, endpoints, cache=None, ttls=None, session=None,
+                 default_params=None, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = endpoints
+        self.cache = cache if cache is not None else ResponseCache()
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.session = session if session is not None else make_session()
+        self.default_params = default_params or {}
+        self.timeout = timeout
+
+    def fetch(self, endpoint, params=None):
+        params = params or {}
+        url = f"{self.base_url}/{self.endpoints[endpoint]}"
+        key = f"{url}?{json.dumps(params, sort_keys=True)}"
+        entry = self.cache.get(key)
+        now = time.time()
+        if entry is not None and now - entry["fetched_at"] < self.ttls.get(endpoint, 0):
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(
+            url, params=dict(self.default_params, **params), headers=headers, timeout=self.timeout
+        )
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = now
+        else:
+            response.raise_for_status()
+            entry = {
+                "fetched_at": now,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": response.json(),
+            }
+        self.cache.put(key, entry)
+        return entry["body"]
+
+
+class FixtureSource(Source):
+    """Replays recorded responses from ``directory`` without any network access"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, endpoint, params=None):
+        path = os.path.join(self.directory, fixture_name(endpoint, params))
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"No recorded response for {endpoint} {params or {}} in {self.directory}")
+
+
+def frame_name(endpoint, params, frame):
+    """Fixture name of the ``frame``-th recorded response to one request"""
+    return f"{fixture_name(endpoint, params)[:-len('.json')]}.{frame}.json"
+
+
+class ReplaySource(Source):
+    """Replays recorded frames in order, one per fetch, then keeps returning the last
+
+    Frames are the ``frame_name`` files in ``directory``, as written by
+    ``RecordingSource(..., frames=True)``.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._positions = {}
+
+    def fetch(self, endpoint, params=None):
+        key = fixture_name(endpoint, params)
+        position = self._positions.get(key, 0)
+        path = os.path.join(self.directory, frame_name(endpoint, params, position))
+        if position > 0 and not os.path.exists(path):
+            path = os.path.join(self.directory, frame_name(endpoint, params, position - 1))
+        else:
+            self._positions[key] = position + 1
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"No recorded frames for {endpoint} {params or {}} in {self.directory}")
+
+
+class RecordingSource(Source):
+    """Passes fetches through to ``source`` and saves each response as a fixture
+
+    With ``frames``, every fetch is kept as the next frame for ``ReplaySource``
+    instead of overwriting one fixture per request.
+    """
+
+    def __init__(self, source, directory, frames=False):
+        self.source = source
+        self.directory = directory
+        self.frames = frames
+        self._counts = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, endpoint, params=None):
+        body = self.source.fetch(endpoint, params)
+        name = fixture_name(endpoint, params)
+        if self.frames:
+            frame = self._counts.get(name, 0)
+            self._counts[name] = frame + 1
+            name = frame_name(endpoint, params, frame)
+        with open(os.path.join(self.directory, name), "w") as f:
+            json.dump(body, f, indent=1)
+        return body
+
+
+def statsapi_source(**kwargs):
+    """MLB Stats API schedule source"""
+    return HTTPSource(STATSAPI_URL, {"schedule": "schedule"}, **kwargs)
+
+
+def odds_api_source(api_key=None, **kwargs):
+    """The Odds API run-line and totals source; the key defaults to $ODDS_API_KEY"""
+    api_key = api_key or os.environ["ODDS_API_KEY"]
+    return HTTPSource(
+        ODDS_API_URL, {"odds": "sports/baseball_mlb/odds"}, default_params={"apiKey": api_key}, **kwargs
+    )
+
+
+def schedule_params(day):
+    """Stats API query for one day's schedule with team abbreviations"""
+    return {"sportId": 1, "date": day.isoformat(), "hydrate": "team"}
+
+
+def parse_schedule(payload):
+    """Stats API schedule payload to a list of {home, away, time, date} dicts
+
+    ``time`` and ``date`` are the local (DISPLAY_TZ) start.
+    """
+    games = []
+    for day in payload.get("dates", []):
+        for game in day["games"]:
+            start = datetime.fromisoformat(game["gameDate"].replace("Z", "+00:00")).astimezone(DISPLAY_TZ)
+            home, away = (
+                game["teams"][side]["team"]["abbreviation"] for side in ("home", "away")
+            )
+            games.append({
+                "home": STATSAPI_ABBREVIATIONS.get(home, home),
+                "away": STATSAPI_ABBREVIATIONS.get(away, away),
+                "time": start.strftime("%I:%M %p").lstrip("0"),
+                "date": start.date().isoformat(),
+            })
+    return games
+
+
+def parse_quotes(payload):
+    """Odds API payload to run-line quote columns, one entry per (event, book)
+
+    Columns are ``event`` (API event id), ``home``, ``away``, ``date`` (local
+    start date), ``book``, ``point`` (home run line) and ``home_price`` /
+    ``away_price`` (American), the input of ``LineHistory.record``. Books
+    missing either side are skipped.
+    """
+    quotes = {
+        name: [] for name in ("event", "home", "away", "date", "book", "point", "home_price", "away_price")
+    }
+    for event in payload:
+        home = TEAM_ABBREVIATIONS.get(event["home_team"])
+        away = TEAM_ABBREVIATIONS.get(event["away_team"])
+        if not (home and away):
+            continue
+        start = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+        day = start.astimezone(DISPLAY_TZ).date().isoformat()
+        for bookmaker in event.get("bookmakers", []):
+            for market in bookmaker["markets"]:
+                if market["key"] != "spreads":
+                    continue
+                sides = {outcome["name"]: outcome for outcome in market["outcomes"]}
+                home_side, away_side = sides.get(event["home_team"]), sides.get(event["away_team"])
+                if home_side is None or away_side is None:
+                    continue
+                quotes["event"].append(event["id"])
+                quotes["home"].append(home)
+                quotes["away"].append(away)
+                quotes["date"].append(day)
+                quotes["book"].append(bookmaker["key"])
+                quotes["point"].append(home_side["point"])
+                quotes["home_price"].append(home_side["price"])
+                quotes["away_price"].append(away_side["price"])
+    return quotes
+
+
+def parse_totals(payload):
+    """Odds API payload to the consensus (lower median) total line per (home, away, date)
+
+    Books without an Over quote are skipped; games no book totals are absent.
+    """
+    points = {}
+    for event in payload:
+        home = TEAM_ABBREVIATIONS.get(event["home_team"])
+        away = TEAM_ABBREVIATIONS.get(event["away_team"])
+        if not (home and away):
+            continue
+        start = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+        key = (home, away, start.astimezone(DISPLAY_TZ).date().isoformat())
+        for bookmaker in event.get("bookmakers", []):
+            for market in bookmaker["markets"]:
+                if market["key"] != "totals":
+                    continue
+                over = next((outcome for outcome in market["outcomes"] if outcome["name"] == "Over"), None)
+                if over is not None:
+                    points.setdefault(key, []).append(over["point"])
+    return {key: float(lower_median([values])[0]) for key, values in points.items()}
+
+
+def fetch_slate(day, schedule_source, odds_source, history=None):
+    """Slate for ``day`` from a schedule and an odds source; games without a line are left out
+
+    Each game gets the consensus (lower median) home run line, the best
+    home price offered at that line and the consensus total (NaN when no
+    book quotes one). Odds are matched to games by home team, away
+    team and local date, since feeds cover several days and a series repeats
+    the same matchup. Quotes are recorded in ``history``, a
+    LineHistory kept across refreshes to track line movement (a fresh one if
+    None).
+    """
+    games = parse_schedule(schedule_source.fetch("schedule", schedule_params(day)))
+    history = history if history is not None else LineHistory()
+    payload = odds_source.fetch("odds", ODDS_PARAMS)
+    history.record(parse_quotes(payload), datetime.now())
+    totals = parse_totals(payload)
+
+    market = history.market()
+    lines = {
+        history.event_game(event): (point, price)
+        for event, point, price, books in zip(market["event"], market["point"], market["home_price"],
+                                              market["books"])
+        if books > 0
+    }
+    slate_games = [
+        dict(game, spread=float(lines[key][0]), price=float(lines[key][1]), total=totals.get(key, float("nan")))
+        for game in games for key in [(game["home"], game["away"], game["date"])] if key in lines
+    ]
+    return make_slate(slate_games)
@@ -0,0 +1,229 @@
+"""Streaming odds: concurrent polling, changed-line detection and row deltas
+
+``LiveOdds`` runs an asyncio loop in a daemon thread. Every ``interval``
+seconds it fetches odds from all of its sources at once, records the quotes
+in a ``LineHistory`` and, for only the games whose consensus line or best
+price moved, rebuilds the prediction rows (spread, price, edge, tier). Each
+change goes out as a delta to every subscriber, so an open page updates in
+seconds without recomputing, or rerunning, anything for unchanged games.
+
+Model probabilities (every market, or the run line alone) come from
+``load()``, which ``PredictionScheduler`` calls after each refresh; the odds
+loop never touches the models. A delta is a
+dict with ``reset`` (True when it replaces every row) and ``rows``, the
+changed rows keyed by matchup.
+
+NumPy, requests and the odds modules are imported on first use, so importing
+this module stays cheap for the app.
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# Directories of recorded odds frames to replay instead of calling the live API
+REPLAY_ENV = "MLB_PREDICTOR_ODDS_REPLAY"
+DEFAULT_INTERVAL = 10
+
+
+def sources_from_env(interval=DEFAULT_INTERVAL):
+    """Odds sources for the app; empty (live odds off) unless configured
+
+    ``$MLB_PREDICTOR_ODDS_REPLAY`` (comma-separated directories) replays
+    recorded frames; otherwise ``$ODDS_API_KEY`` enables the Odds API.
+    """
+    replay = os.environ.get(REPLAY_ENV)
+    if replay:
+        from mlb_predictor.ingest import ReplaySource
+
+        return [ReplaySource(directory) for directory in replay.split(",")]
+    if os.environ.get("ODDS_API_KEY"):
+        from mlb_predictor.ingest import odds_api_source
+
+        # Cached responses must not outlive one polling interval
+        return [odds_api_source(ttls={"odds": interval})]
+    return []
+
+
+class Subscription:
+    """Deltas for one reader, oldest first; safe to fill from the odds thread"""
+
+    def __init__(self):
+        self._deltas = deque()
+
+    def put(self, delta):
+        self._deltas.append(delta)
+
+    def drain(self):
+        """Every delta received since the last drain"""
+        deltas = []
+        while self._deltas:
+            deltas.append(self._deltas.popleft())
+        return deltas
+
+
+def apply_deltas(rows, deltas):
+    """Fold deltas into a {matchup: row} dict in place; returns True if anything changed"""
+    for delta in deltas:
+        if delta["reset"]:
+            rows.clear()
+        rows.update(delta["rows"])
+    return bool(deltas)
+
+
+class LiveOdds(threading.Thread):
+    """Daemon thread polling odds sources and publishing row deltas"""
+
+    def __init__(self, sources, interval=DEFAULT_INTERVAL):
+        super().__init__(name="live-odds", daemon=True)
+        self.sources = list(sources)
+        self.interval = interval
+        # Latest row per matchup, in display order
+        self.rows = {}
+        self.history = None
+        self.last_error = None
+        self._games = None
+        self._teams = None
+        self._probabilities = None
+        # Slate position of each (home, away, date) game; date is "" for undated slates
+        self._positions = {}
+        # Readers that go away (closed sessions) drop out on their own
+        self._subscribers = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def subscribe(self):
+        """New Subscription, primed with the current rows"""
+        subscription = Subscription()
+        with self._lock:
+            subscription.put({"reset": True, "rows": dict(self.rows)})
+            self._subscribers.add(subscription)
+        return subscription
+
+    def _publish(self, delta):
+        for subscription in list(self._subscribers):
+            subscription.put(delta)
+
+    def load(self, games, teams, probabilities):
+        """Replace the slate and its model probabilities, priced at the latest known odds"""
+        import numpy as np
+
+        if not isinstance(probabilities, Mapping):
+            probabilities = {"run_line": probabilities}
+        with self._lock:
+            self._games = np.array(games, copy=True)
+            self._teams = list(teams)
+            self._probabilities = {
+                market: np.asarray(values, dtype=np.float64) for market, values in probabilities.items()
+            }
+            self._positions = {
+                (self._teams[home], self._teams[away], day): i
+                for i, (home, away, day) in enumerate(zip(self._games["home"], self._games["away"],
+                                                          self._games["date"]))
+            }
+            if self.history is not None and self.history.event_keys:
+                self._reprice(np.arange(len(self.history.event_keys)))
+            self.rows = self._rows(np.arange(len(self._games)))
+            self._publish({"reset": True, "rows": dict(self.rows)})
+
+    def _reprice(self, events):
+        """Write the market for ``events`` into the slate; returns positions of games that changed"""
+        import numpy as np
+
+        market = self.history.market(events)
+        changed = []
+        for event, point, price, books in zip(market["event"], market["point"], market["home_price"],
+                                              market["books"]):
+            position = self._position(event)
+            if position is None or books == 0:
+                continue
+            spread, old_price = self._games["spread"][position], self._games["price"][position]
+            same_price = old_price == price or (np.isnan(old_price) and np.isnan(price))
+            if spread != point or not same_price:
+                self._games["spread"][position] = point
+                self._games["price"][position] = price
+                changed.append(position)
+        return np.array(changed, dtype=np.int64)
+
+    def _position(self, event):
+        """Slate position of an odds event: same teams on the same date, or same teams if the slate is undated"""
+        home, away, day = self.history.event_game(event)
+        position = self._positions.get((home, away, day))
+        if position is None:
+            position = self._positions.get((home, away, ""))
+        return position
+
+    def _rows(self, positions):
+        from mlb_predictor.recommendations import build_predictions
+
+        probabilities = {market: values[positions] for market, values in self._probabilities.items()}
+        rows = build_predictions(self._games[positions], self._teams, probabilities)
+        return {row["matchup"]: MappingProxyType(row) for row in rows}
+
+    def apply(self, quotes, time=None):
+        """Record one batch of quotes and publish the rows they change; returns the delta or None"""
+        from mlb_predictor.odds import LineHistory
+
+        with self._lock:
+            if self.history is None:
+                self.history = LineHistory()
+            moved = self.history.record(quotes, time or datetime.now())
+            if self._games is None or not len(moved):
+                return None
+            positions = self._reprice(moved)
+            if not len(positions):
+                return None
+            rows = self._rows(positions)
+            self.rows.update(rows)
+            delta = {"reset": False, "rows": rows}
+            self._publish(delta)
+            return delta
+
+    async def poll(self):
+        """Fetch every source concurrently and apply their combined quotes; returns the delta or None"""
+        from mlb_predictor.ingest import ODDS_PARAMS, parse_quotes
+
+        # Sources are blocking (requests, files); each fetch gets its own worker thread
+        responses = await asyncio.gather(
+            *(asyncio.to_thread(source.fetch, "odds", ODDS_PARAMS) for source in self.sources),
+            return_exceptions=True,
+        )
+        quotes = None
+        for source, response in zip(self.sources, responses):
+            if isinstance(response, Exception):
+                logger.warning("Odds fetch from %r failed: %s", source, response)
+                self.last_error = response
+                continue
+            parsed = parse_quotes(response)
+            if quotes is None:
+                quotes = parsed
+            else:
+                for name, values in parsed.items():
+                    quotes[name].extend(values)
+        if quotes is None:
+            return None
+        return self.apply(quotes)
+
+    async def stream(self):
+        """Poll until stopped"""
+        while not self._stopping.is_set():
+            try:
+                await self.poll()
+            except Exception as exc:
+                logger.exception("Live odds update failed")
+                self.last_error = exc
+            await asyncio.sleep(self.interval)
+
+    def run(self):
+        asyncio.run(self.stream())
+
+    def stop(self):
+        """Ask the worker to exit after its current poll"""
+        self._stopping.set()
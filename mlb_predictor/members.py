@@ -0,0 +1,96 @@
+"""Registry of estimators that can fill an ensemble slot
+
+Each entry is a factory returning an unfitted scikit-learn classifier with
+``predict_proba``. ``MLBPredictor`` has a forest slot and an "SVM" slot; the
+SVM slot defaults to ``svc`` but can be switched per deployment with the
+``MLB_PREDICTOR_SVM_MEMBER`` environment variable (or ``--svm-member`` when
+training) to a member whose fit time grows linearly with the sample count.
+
+Members with ``partial_fit`` (``sgd_logistic``) are updated in place by
+incremental retraining; the others are refit on recent rows. Members with a
+true ``raw_features`` attribute (``run_simulator``) are given unscaled rows.
+Out-of-core training fits members that can neither stream nor grow trees
+on the most recent rows only, at most ``MAX_FIT_ROWS`` of them.
+"""
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.svm import SVC
+
+SVM_MEMBER_ENV = "MLB_PREDICTOR_SVM_MEMBER"
+DEFAULT_RF_MEMBER = "random_forest"
+DEFAULT_SVM_MEMBER = "svc"
+
+# Rows out-of-core training fits a non-streaming member on, where fewer than a batch
+MAX_FIT_ROWS = {
+    # About 4 s at 5,000 rows; 10,000 take over four times as long
+    "svc": 5000,
+}
+
+
+def _random_forest():
+    return RandomForestClassifier(n_estimators=100, random_state=42)
+
+
+def _svc():
+    # Platt scaling runs an internal 5-fold CV: roughly quadratic or worse in samples
+    return SVC(probability=True, random_state=42)
+
+
+def _rbf_logistic():
+    # Fixed-size RBF feature map + logistic regression: linear in samples,
+    # and log-loss training gives usable probabilities without a calibration pass
+    return make_pipeline(
+        Nystroem(kernel="rbf", n_components=200, random_state=42),
+        LogisticRegression(max_iter=1000),
+    )
+
+
+def _sgd_logistic():
+    # Linear, and streaming: incremental retraining takes partial_fit steps on new rows
+    return SGDClassifier(loss="log_loss", alpha=1e-3, random_state=42)
+
+
+def _run_simulator():
+    # Imported here: the simulator reads the feature layout from mlb_predictor.model
+    from mlb_predictor.simulator import RunLineSimulator
+
+    return RunLineSimulator(random_state=42)
+
+
+def _hist_gbm():
+    return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.05, random_state=42)
+
+
+MEMBERS = {
+    "random_forest": _random_forest,
+    "svc": _svc,
+    "rbf_logistic": _rbf_logistic,
+    "hist_gbm": _hist_gbm,
+    "sgd_logistic": _sgd_logistic,
+    "run_simulator": _run_simulator,
+}
+
+
+def register_member(name, factory, max_fit_rows=None):
+    """Make ``factory`` (no-argument callable returning a classifier) selectable as ``name``
+
+    ``max_fit_rows`` caps the rows out-of-core training fits it on, for
+    members whose fit time grows quickly with the sample count.
+    """
+    MEMBERS[name] = factory
+    if max_fit_rows is not None:
+        MAX_FIT_ROWS[name] = max_fit_rows
+
+
+def make_member(name, params=None):
+    """Fresh, unfitted estimator for a registered member name, with ``params`` applied"""
+    try:
+        factory = MEMBERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown ensemble member {name!r}; choose from {', '.join(sorted(MEMBERS))}")
+    estimator = factory()
+    if params:
+        estimator.set_params(**params)
+    return estimator
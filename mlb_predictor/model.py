@@ -0,0 +1,626 @@
+import hashlib
+import itertools
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+from joblib import Parallel, delayed
+from threadpoolctl import threadpool_limits
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from mlb_predictor.forest import compilable, compile_forest
+from mlb_predictor.incremental import (
+    add_trees, forest_schedule, grow_forest, partial_fit_member, rescale_member, scaler_state,
+)
+from mlb_predictor.members import (
+    DEFAULT_RF_MEMBER, DEFAULT_SVM_MEMBER, MAX_FIT_ROWS, SVM_MEMBER_ENV, make_member,
+)
+from mlb_predictor.pipeline import FEATURE_DTYPE, ScoringPipeline, scaled_copy
+
+# Column order of every feature row the models see
+FEATURE_NAMES = [
+    "home_win_pct", "away_win_pct",
+    "home_runs_per_game", "away_runs_per_game",
+    "home_era", "away_era",
+    "home_advantage", "adjustment",
+]
+# Values of the last two features at prediction time
+EXTRA_FEATURES = (0.05, 0.0)
+
+ARTIFACT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+# Fitted estimators stored in each artifact bundle, by attribute name
+ARTIFACT_MEMBERS = ["scaler", "model_rf", "model_svm"]
+# Fitted estimators that vote in the ensemble, by attribute name
+ENSEMBLE_MEMBERS = ["model_rf", "model_svm"]
+# Share of each member's probability in the ensemble unless a tuned artifact says otherwise
+DEFAULT_WEIGHTS = {"model_rf": 0.6, "model_svm": 0.4}
+
+# Cores training may use; by default all but one, left for the app's server threads
+TRAIN_JOBS_ENV = "MLB_PREDICTOR_TRAIN_JOBS"
+# Below this many rows, worker process startup costs more than concurrent fitting saves
+PROCESS_POOL_MIN_ROWS = 5000
+
+# Largest batch scored through compiled forests; past this sklearn's own traversal is faster
+COMPILED_MAX_ROWS = 512
+
+# Incremental updates: trees grown (and oldest retired) per update, rows they and
+# non-streaming members are fitted on, and when a full refit is due instead
+UPDATE_TREES = 10
+RECENT_ROWS = 1000
+FULL_REFIT_EVERY = 7
+FULL_REFIT_GROWTH = 0.25
+
+
+def default_train_jobs():
+    """Core budget for training from $MLB_PREDICTOR_TRAIN_JOBS, else all cores but one"""
+    if os.environ.get(TRAIN_JOBS_ENV):
+        return max(1, int(os.environ[TRAIN_JOBS_ENV]))
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+    return max(1, available - 1)
+
+
+def _core_shares(estimators, n_jobs):
+    """Split a core budget: one core per single-threaded member, the rest to members with n_jobs"""
+    multi = [i for i, estimator in enumerate(estimators) if "n_jobs" in estimator.get_params()]
+    spare = max(len(multi), n_jobs - (len(estimators) - len(multi)))
+    return [max(1, spare // len(multi)) if i in multi else 1 for i in range(len(estimators))]
+
+
+def _fit_member(estimator, X, y, n_threads, fit=None):
+    """Fit one member within a thread budget (joblib workers, OpenMP and BLAS alike)
+
+    ``fit(estimator, X, y)`` replaces the plain ``estimator.fit`` call.
+    """
+    params = estimator.get_params()
+    if "n_jobs" in params:
+        estimator.set_params(n_jobs=n_threads)
+    with threadpool_limits(limits=n_threads):
+        if fit is None:
+            estimator.fit(X, y)
+        else:
+            fit(estimator, X, y)
+    if "n_jobs" in params:
+        # Small slates score faster single-threaded
+        estimator.set_params(n_jobs=params["n_jobs"])
+    return estimator
+
+
+def _inputs(estimator, X, X_scaled):
+    """Rows as a member expects them: raw for members with ``raw_features``, scaled otherwise"""
+    return X if getattr(estimator, "raw_features", False) else X_scaled
+
+
+class MLBPredictor:
+    def __init__(self, rf_member=DEFAULT_RF_MEMBER, svm_member=None, n_jobs=None,
+                 params=None, weights=None, tuning=None):
+        # Estimators come from the member registry; the SVM slot is chosen per deployment
+        svm_member = svm_member or os.environ.get(SVM_MEMBER_ENV, DEFAULT_SVM_MEMBER)
+        self.members = {"model_rf": rf_member, "model_svm": svm_member}
+        # Hyperparameters and ensemble weights, usually found by mlb_predictor.tune
+        self.params = {name: dict((params or {}).get(name) or {}) for name in ENSEMBLE_MEMBERS}
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.tuning = tuning
+        self.model_rf = make_member(rf_member, self.params["model_rf"])
+        self.model_svm = make_member(svm_member, self.params["model_svm"])
+        self.n_jobs = n_jobs or default_train_jobs()
+        self.scaler = StandardScaler()
+        self.is_trained = False
+        self.rf_accuracy = None
+        self.svm_accuracy = None
+        self.data_version = None
+        # Where the training rows came from: "synthetic", "games" or "shards"
+        self.training_source = None
+        self.artifact_version = None
+        self.created_at = None
+        # Identifies the fitted state for prediction caches; changes on every fit, update and load
+        self.model_key = None
+        # Optional PredictionCache consulted by predict_features
+        self.cache = None
+        # ScoringPipelines over the fitted state, with and without compiled forests, built on first use
+        self._pipelines = {}
+        # CompiledForest per forest member, valid for the fitted state _compiled_key
+        self.compiled = {}
+        self._compiled_key = None
+        # Members load() left on disk until first use, as {name: path}
+        self._deferred = {}
+        # Rows folded in so far, and at the last full refit, for the refit policy
+        self.rows_seen = 0
+        self.rows_at_refit = 0
+        self.updates_since_refit = 0
+
+    def generate_training_data(self, n_samples=1000, seed=42):
+        """Generate synthetic training data for demonstration (see mlb_predictor.synthetic)"""
+        # Imported here: the generator reads the feature layout from this module
+        from mlb_predictor.synthetic import generate
+
+        return generate(n_samples, seed=seed)
+
+    def training_data_version(self, n_samples=1000):
+        """Fingerprint of the training inputs, used to key the shared model"""
+        return data_version(*self.generate_training_data(n_samples))
+
+    def config(self):
+        """Constructor arguments that rebuild this predictor's members, params and weights"""
+        return {
+            "rf_member": self.members["model_rf"],
+            "svm_member": self.members["model_svm"],
+            "params": self.params,
+            "weights": self.weights,
+            "tuning": self.tuning,
+        }
+
+    def fit(self, X, y, source="games"):
+        """Fit the scaler and ensemble members on a prepared feature matrix
+
+        The data version of ``X``, ``y`` and ``source`` are recorded for the
+        artifact manifest. With a core budget above one and enough rows, members are fitted
+        concurrently in worker processes that share the budget; otherwise
+        they are fitted in turn, each allowed the whole budget.
+        """
+        X = np.asarray(X, dtype=FEATURE_DTYPE)
+        X_scaled = scaled_copy(X, self.scaler.fit(X))
+
+        estimators = [getattr(self, name) for name in ENSEMBLE_MEMBERS]
+        if self.n_jobs > 1 and len(X_scaled) >= PROCESS_POOL_MIN_ROWS:
+            shares = _core_shares(estimators, self.n_jobs)
+            fitted = Parallel(n_jobs=len(estimators), backend="loky")(
+                delayed(_fit_member)(estimator, _inputs(estimator, X, X_scaled), y, share)
+                for estimator, share in zip(estimators, shares)
+            )
+        else:
+            fitted = [
+                _fit_member(estimator, _inputs(estimator, X, X_scaled), y, self.n_jobs)
+                for estimator in estimators
+            ]
+        for name, estimator in zip(ENSEMBLE_MEMBERS, fitted):
+            setattr(self, name, estimator)
+
+        self.is_trained = True
+        self.model_key = uuid.uuid4().hex
+        self.data_version = data_version(X, y)
+        self.training_source = source
+        self.rows_seen = self.rows_at_refit = len(X)
+        self.updates_since_refit = 0
+        return self
+
+    def update(self, X_new, y_new, X_recent=None, y_recent=None):
+        """Fold newly labelled rows into the fitted models without a full refit
+
+        The scaler is updated with ``partial_fit`` and fitted members are
+        rescaled to match. Forests grow UPDATE_TREES trees on the recent rows
+        (``X_recent``, which should end with the new ones; default just the
+        new rows) and retire as many old ones, streaming members take a
+        ``partial_fit`` step on the new rows, and any other member is refit on
+        the recent rows. Cost depends on the recent window, not on history.
+        """
+        if not self.is_trained:
+            raise ValueError("Cannot update an untrained predictor; fit it first")
+        if X_recent is None:
+            X_recent, y_recent = X_new, y_new
+
+        X_new = np.asarray(X_new, dtype=FEATURE_DTYPE)
+        X_recent = np.asarray(X_recent, dtype=FEATURE_DTYPE)
+        old = scaler_state(self.scaler)
+        self.scaler.partial_fit(X_new)
+        new = scaler_state(self.scaler)
+        recent_scaled = scaled_copy(X_recent, self.scaler)
+
+        for name in ENSEMBLE_MEMBERS:
+            estimator = getattr(self, name)
+            if not rescale_member(estimator, old, new):
+                estimator = make_member(self.members[name], self.params[name])
+                _fit_member(estimator, _inputs(estimator, X_recent, recent_scaled), y_recent, self.n_jobs)
+            elif hasattr(estimator, "estimators_"):
+                _fit_member(estimator, recent_scaled, y_recent, self.n_jobs,
+                            fit=lambda forest, X, y: grow_forest(forest, X, y, UPDATE_TREES))
+            else:
+                partial_fit_member(estimator, scaled_copy(X_new, self.scaler), y_new)
+            setattr(self, name, estimator)
+
+        self.model_key = uuid.uuid4().hex
+        self.rows_seen += len(X_new)
+        self.updates_since_refit += 1
+        return self
+
+    def full_refit_due(self):
+        """True once enough updates or new rows have piled up since the last full fit"""
+        return (
+            self.updates_since_refit >= FULL_REFIT_EVERY
+            or self.rows_seen - self.rows_at_refit > FULL_REFIT_GROWTH * self.rows_at_refit
+        )
+
+    def retrain(self, X, y, n_new):
+        """Bring the models up to date with history ``X``, ``y`` whose last ``n_new`` rows are new
+
+        Updates incrementally, or refits on all of ``X`` when the predictor is
+        untrained or a full refit is due.
+        """
+        if n_new == 0 and self.is_trained:
+            return self
+        if not self.is_trained or n_new >= len(X) or self.full_refit_due():
+            return self.fit(X, y)
+        recent = slice(max(0, len(X) - RECENT_ROWS), len(X))
+        return self.update(X[-n_new:], y[-n_new:], X[recent], y[recent])
+
+    def train_models(self, X=None, y=None, source=None):
+        """Train the ensemble models, on synthetic data unless X and y are given
+
+        ``source`` is recorded in the artifact manifest; it defaults to
+        "synthetic" without X and y and to "games" with them.
+        """
+        if X is None:
+            X, y = self.generate_training_data()
+            source = source or "synthetic"
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        self.fit(X_train, y_train, source or "games")
+        rf_accuracy, svm_accuracy = self.score_members(X_test, y_test)
+        self.data_version = data_version(X, y)
+        # The held-out rows are part of the history this model covers
+        self.rows_seen = self.rows_at_refit = len(X)
+        return rf_accuracy, svm_accuracy
+
+    def train_out_of_core(self, dataset, test_fraction=0.2, batch_rows=None):
+        """Train on a ShardDataset without holding it in memory; returns held-out accuracies
+
+        The last ``test_fraction`` of rows (the most recent games) is held
+        out; both ranges are read in batches of ``batch_rows`` (default
+        mlb_predictor.shards.BATCH_ROWS). One streaming pass fits the scaler.
+        Then ``partial_fit`` members step through every training batch,
+        forests grow their trees spread evenly over the batches, and other
+        members are fitted on the last ``batch_rows`` training rows, or fewer
+        where members.MAX_FIT_ROWS caps them (``svc``). Peak memory follows
+        the batch size, not the dataset size.
+        """
+        from mlb_predictor.shards import BATCH_ROWS, split_index
+
+        batch_rows = batch_rows or BATCH_ROWS
+        split = split_index(len(dataset), test_fraction)
+
+        self.scaler = StandardScaler()
+        for X, _ in dataset.batches(0, split, batch_rows):
+            self.scaler.partial_fit(X)
+
+        n_batches = dataset.n_batches(0, split, batch_rows)
+        for name in ENSEMBLE_MEMBERS:
+            estimator = make_member(self.members[name], self.params[name])
+            if hasattr(estimator, "partial_fit"):
+                for X, y in dataset.batches(0, split, batch_rows):
+                    partial_fit_member(estimator, _inputs(estimator, X, scaled_copy(X, self.scaler)), y)
+            elif hasattr(estimator, "n_estimators") and hasattr(estimator, "warm_start"):
+                schedule = forest_schedule(estimator.n_estimators, n_batches)
+                for (X, y), n_trees in zip(dataset.batches(0, split, batch_rows), schedule):
+                    if n_trees:
+                        _fit_member(estimator, _inputs(estimator, X, scaled_copy(X, self.scaler)), y, self.n_jobs,
+                                    fit=lambda forest, X, y: add_trees(forest, X, y, n_trees))
+            else:
+                fit_rows = min(batch_rows, MAX_FIT_ROWS.get(self.members[name], batch_rows))
+                X, y = dataset.rows(max(0, split - fit_rows), split)
+                _fit_member(estimator, _inputs(estimator, X, scaled_copy(X, self.scaler)), y, self.n_jobs)
+            setattr(self, name, estimator)
+
+        correct = dict.fromkeys(ENSEMBLE_MEMBERS, 0)
+        for X, y in dataset.batches(split, None, batch_rows):
+            X_scaled = scaled_copy(X, self.scaler)
+            for name in ENSEMBLE_MEMBERS:
+                estimator = getattr(self, name)
+                correct[name] += int((estimator.predict(_inputs(estimator, X, X_scaled)) == y).sum())
+        n_test = max(1, len(dataset) - split)
+        self.rf_accuracy = correct["model_rf"] / n_test
+        self.svm_accuracy = correct["model_svm"] / n_test
+
+        self.is_trained = True
+        self.model_key = uuid.uuid4().hex
+        self.data_version = dataset.version
+        self.training_source = "shards"
+        self.rows_seen = self.rows_at_refit = len(dataset)
+        self.updates_since_refit = 0
+        return self.rf_accuracy, self.svm_accuracy
+
+    def score_members(self, X_test, y_test):
+        """Record and return each member's accuracy on held-out rows"""
+        X_test_scaled = scaled_copy(X_test, self.scaler)
+        self.rf_accuracy = self.model_rf.score(_inputs(self.model_rf, X_test, X_test_scaled), y_test)
+        self.svm_accuracy = self.model_svm.score(_inputs(self.model_svm, X_test, X_test_scaled), y_test)
+        return self.rf_accuracy, self.svm_accuracy
+
+    @staticmethod
+    def feature_row(home_team_stats, away_team_stats):
+        """Feature values for one matchup, in FEATURE_NAMES order"""
+        return (
+            home_team_stats['win_pct'], away_team_stats['win_pct'],
+            home_team_stats['runs_per_game'], away_team_stats['runs_per_game'],
+            home_team_stats['era'], away_team_stats['era'],
+            *EXTRA_FEATURES
+        )
+
+    @staticmethod
+    def build_features(games, team_stats):
+        """Feature matrix with one row per game"""
+        features = np.empty((len(games), len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+        if isinstance(games, np.ndarray):
+            # Columnar slate and TeamTable: one gather covers every game
+            n_stats = len(FEATURE_NAMES) - len(EXTRA_FEATURES)
+            features[:, :n_stats] = team_stats.matchup_stats(games["home"], games["away"]).reshape(len(games), -1)
+            features[:, n_stats:] = EXTRA_FEATURES
+            return features
+        for i, game in enumerate(games):
+            features[i] = MLBPredictor.feature_row(team_stats[game["home"]], team_stats[game["away"]])
+        return features
+
+    def predict_features(self, features, spreads=None):
+        """Ensemble cover probabilities for a prebuilt feature matrix, via ``cache`` if set
+
+        ``spreads`` holds each row's home line for members that price it (the
+        run simulator); without it they price their default line.
+        """
+        if not self.is_trained:
+            self.train_models()
+        if self.cache is not None:
+            return self.cache.lookup(self.model_key, features, self._predict_uncached, spreads)
+        return self._predict_uncached(features, spreads)
+
+    def __getattr__(self, name):
+        # Only reached for missing attributes: read a member load() deferred
+        deferred = self.__dict__.get("_deferred", {})
+        if name not in deferred:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        estimator = joblib.load(deferred[name])
+        setattr(self, name, estimator)
+        deferred.pop(name, None)
+        return estimator
+
+    def compiled_members(self):
+        """CompiledForest for each forest member of the current fitted state, compiled on first use"""
+        if self._compiled_key != self.model_key:
+            self.compiled = {
+                name: compile_forest(getattr(self, name))
+                for name in ENSEMBLE_MEMBERS if compilable(getattr(self, name))
+            }
+            self._compiled_key = self.model_key
+        return self.compiled
+
+    def scoring_pipeline(self, compiled=True):
+        """ScoringPipeline over the current fitted state, rebuilt after every fit, update and load
+
+        With ``compiled``, forest members are scored through their CompiledForest.
+        """
+        pipeline = self._pipelines.get(compiled)
+        if pipeline is None or pipeline.model_key != self.model_key:
+            forests = self.compiled_members() if compiled else {}
+            members = [
+                (forests[name] if name in forests else getattr(self, name), self.weights[name])
+                for name in ENSEMBLE_MEMBERS
+            ]
+            pipeline = self._pipelines[compiled] = ScoringPipeline(self.scaler, members, self.model_key)
+        return pipeline
+
+    def _predict_uncached(self, features, spreads=None):
+        return self.scoring_pipeline(compiled=len(features) <= COMPILED_MAX_ROWS).predict_proba(features, spreads)
+
+    def predict_games(self, games, team_stats):
+        """Predict outcomes for a whole slate with one call per model"""
+        return self.predict_features(self.build_features(games, team_stats), slate_column(games, "spread"))
+
+    def league_runs(self):
+        """Mean runs per game over the training rows, as recorded by the fitted scaler"""
+        columns = [FEATURE_NAMES.index("home_runs_per_game"), FEATURE_NAMES.index("away_runs_per_game")]
+        return float(self.scaler.mean_[columns].mean())
+
+    def predict_market_features(self, features, totals, spreads=None):
+        """Probabilities for every market (see predict_markets) from a prebuilt feature matrix"""
+        # Imported here: the simulator reads the feature layout from this module
+        from mlb_predictor.simulator import market_probabilities
+
+        run_line = self.predict_features(features, spreads)
+        columns = [FEATURE_NAMES.index(name) for name in (
+            "home_runs_per_game", "away_runs_per_game", "home_era", "away_era",
+        )]
+        markets = market_probabilities(
+            *(features[:, column] for column in columns), totals, league_runs=self.league_runs()
+        )
+        return {"moneyline": markets["moneyline"], "run_line": run_line, "total": markets["total"]}
+
+    def predict_markets(self, games, team_stats):
+        """Home win, home run-line cover and over probabilities for a slate, keyed by tables.MARKETS
+
+        Features are built once and shared. The run line is the ensemble's
+        cover probability; the moneyline and each game's total come from the
+        run model of mlb_predictor.simulator, calculated exactly at the
+        league scoring level of the training rows, which costs less than the
+        ensemble itself. Those two are not fitted to results, so they are
+        uncalibrated. A game without a quoted total gets NaN for the over.
+        """
+        return self.predict_market_features(
+            self.build_features(games, team_stats), slate_column(games, "total"), slate_column(games, "spread")
+        )
+
+    def predict_game(self, home_team_stats, away_team_stats):
+        """Predict outcome for a single game"""
+        features = np.array(self.feature_row(home_team_stats, away_team_stats), dtype=FEATURE_DTYPE).reshape(1, -1)
+        return self.predict_features(features)[0]
+
+    def save(self, models_dir="models"):
+        """Write the fitted models as a new versioned bundle and mark it latest
+
+        A published bundle is never overwritten: a second save within the same
+        second of the same data gets a numbered version.
+        """
+        if not self.is_trained:
+            raise ValueError("Cannot save an untrained predictor")
+
+        created_at = datetime.now(timezone.utc).replace(microsecond=0)
+        base = f"{created_at:%Y%m%dT%H%M%S}-{self.data_version[:8]}"
+        os.makedirs(models_dir, exist_ok=True)
+        for n in itertools.count():
+            version = f"{base}-{n}" if n else base
+            bundle_dir = os.path.join(models_dir, version)
+            try:
+                os.mkdir(bundle_dir)
+                break
+            except FileExistsError:
+                pass
+
+        files = {}
+        for name in ARTIFACT_MEMBERS:
+            filename = f"{name}.joblib"
+            joblib.dump(getattr(self, name), os.path.join(bundle_dir, filename))
+            files[name] = filename
+        # Compiled forests too: a fraction of the size, and all scoring needs. Dumped
+        # uncompressed so their arrays can be memory-mapped on load
+        compiled = {}
+        for name, forest in self.compiled_members().items():
+            filename = f"{name}.compiled.joblib"
+            joblib.dump(forest, os.path.join(bundle_dir, filename))
+            compiled[name] = filename
+
+        manifest = {
+            "format": ARTIFACT_FORMAT,
+            "version": version,
+            "created_at": f"{created_at:%Y-%m-%dT%H:%M:%S}Z",
+            "feature_names": FEATURE_NAMES,
+            "training_data_version": self.data_version,
+            "training_source": self.training_source,
+            "sklearn_version": sklearn.__version__,
+            "members": self.members,
+            "params": self.params,
+            "weights": self.weights,
+            "tuning": self.tuning,
+            "training": {
+                "rows_seen": self.rows_seen,
+                "rows_at_refit": self.rows_at_refit,
+                "updates_since_refit": self.updates_since_refit,
+            },
+            "metrics": {
+                "rf_accuracy": self.rf_accuracy,
+                "svm_accuracy": self.svm_accuracy,
+            },
+            "files": files,
+            "compiled": compiled,
+        }
+        with open(os.path.join(bundle_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Swap the pointer atomically so readers never see a half-written bundle
+        latest_tmp = os.path.join(models_dir, LATEST_FILE + ".tmp")
+        with open(latest_tmp, "w") as f:
+            f.write(version)
+        os.replace(latest_tmp, os.path.join(models_dir, LATEST_FILE))
+
+        self.artifact_version = version
+        self.model_key = self._compiled_key = version
+        self.created_at = created_at
+        return bundle_dir
+
+    @classmethod
+    def load(cls, bundle_dir, mmap_mode="r"):
+        """Load a saved bundle, memory-mapping the compiled forest arrays by default
+
+        Members saved with a compiled form are scored through it, and the
+        estimator itself is only read when first accessed (e.g. to update it).
+        scikit-learn estimators are always read onto the heap: trees copy their
+        node arrays when unpickled, so mapping them would save nothing.
+        """
+        with open(os.path.join(bundle_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported artifact format: {manifest.get('format')}")
+        if manifest["feature_names"] != FEATURE_NAMES:
+            raise ValueError(
+                f"Artifact {manifest['version']} was trained on a different feature schema"
+            )
+
+        predictor = cls(**manifest_config(manifest))
+        compiled = manifest.get("compiled", {})
+        for name, filename in manifest["files"].items():
+            path = os.path.join(bundle_dir, filename)
+            if name in compiled:
+                # Scoring uses the compiled form; the estimator is read only if training needs it
+                delattr(predictor, name)
+                predictor._deferred[name] = path
+            else:
+                setattr(predictor, name, joblib.load(path))
+        if "compiled" in manifest:
+            predictor.compiled = {
+                name: joblib.load(os.path.join(bundle_dir, filename), mmap_mode=mmap_mode)
+                for name, filename in compiled.items()
+            }
+            predictor._compiled_key = manifest["version"]
+
+        predictor.rf_accuracy = manifest["metrics"]["rf_accuracy"]
+        predictor.svm_accuracy = manifest["metrics"]["svm_accuracy"]
+        predictor.data_version = manifest["training_data_version"]
+        predictor.training_source = manifest.get("training_source")
+        predictor.artifact_version = manifest["version"]
+        predictor.model_key = manifest["version"]
+        predictor.created_at = datetime.fromisoformat(manifest["created_at"].rstrip("Z")).replace(tzinfo=timezone.utc)
+        training = manifest.get("training", {})
+        predictor.rows_seen = training.get("rows_seen", 0)
+        predictor.rows_at_refit = training.get("rows_at_refit", 0)
+        predictor.updates_since_refit = training.get("updates_since_refit", 0)
+        predictor.is_trained = True
+        return predictor
+
+
+def slate_column(games, name):
+    """One numeric column of a slate array or list of game dicts; NaN where a game has none"""
+    if isinstance(games, np.ndarray):
+        return games[name].astype(np.float64)
+    return np.array([game.get(name, np.nan) for game in games], dtype=np.float64)
+
+
+def data_version(X, y):
+    """Short content hash of a training set"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def manifest_config(manifest):
+    """MLBPredictor arguments recorded in an artifact manifest"""
+    members = manifest.get("members", {})
+    return {
+        "rf_member": members.get("model_rf", DEFAULT_RF_MEMBER),
+        "svm_member": members.get("model_svm"),
+        "params": manifest.get("params"),
+        "weights": manifest.get("weights"),
+        "tuning": manifest.get("tuning"),
+    }
+
+
+def latest_config(models_dir="models"):
+    """MLBPredictor arguments of the latest bundle, so retraining keeps its tuned setup"""
+    version = latest_artifact_version(models_dir)
+    if version is None:
+        return {}
+    with open(os.path.join(models_dir, version, MANIFEST_FILE)) as f:
+        return manifest_config(json.load(f))
+
+
+def latest_artifact_version(models_dir="models"):
+    """Name of the most recently published bundle, or None if there is none"""
+    try:
+        with open(os.path.join(models_dir, LATEST_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_latest(models_dir="models", mmap_mode="r"):
+    """Load the most recently published bundle, or None if there is none"""
+    version = latest_artifact_version(models_dir)
+    if version is None:
+        return None
+    return MLBPredictor.load(os.path.join(models_dir, version), mmap_mode=mmap_mode)
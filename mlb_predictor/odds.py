@@ -0,0 +1,210 @@
+"""Odds conversion, vig removal and compact line-movement history
+
+Prices are handled as arrays, one element per (game, sportsbook) quote, so a
+refresh with thousands of quotes is a few NumPy operations. A quote is the
+home run line (``point``) with the American price of each side.
+
+``LineHistory`` keeps every quote change in one packed structured array plus
+a dense (event x book) index of the latest quote. Recording a refresh returns
+the events whose quotes moved, and ``market`` recomputes consensus line, best
+price and no-vig probability for just those events.
+"""
+import numpy as np
+
+# One stored quote change: 26 bytes
+QUOTE_DTYPE = np.dtype([
+    ("event", np.int32),
+    ("book", np.int16),
+    ("time", "datetime64[s]"),
+    ("point", np.float32),
+    ("home_price", np.int32),
+    ("away_price", np.int32),
+])
+
+
+def american_to_decimal(american):
+    """Decimal odds (total return per unit staked) for American odds"""
+    american = np.asarray(american, dtype=np.float64)
+    return np.where(american > 0, 1 + american / 100, 1 + 100 / -american)
+
+
+def decimal_to_american(decimal):
+    """American odds for decimal odds"""
+    decimal = np.asarray(decimal, dtype=np.float64)
+    return np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1))
+
+
+def implied_probability(american):
+    """Break-even probability of a price, vig included"""
+    return 1 / american_to_decimal(american)
+
+
+def remove_vig(home_implied, away_implied):
+    """No-vig probabilities of both sides, and the book's overround
+
+    Proportional method: each side's implied probability is divided by their
+    sum, which is 1 plus the bookmaker's margin.
+    """
+    total = np.asarray(home_implied) + np.asarray(away_implied)
+    return home_implied / total, away_implied / total, total - 1
+
+
+def price_edge(probability, american):
+    """Probability above the break-even probability of the price actually offered"""
+    return probability - implied_probability(american)
+
+
+def lower_median(values):
+    """Per row, the lower of the two middle non-NaN values (the middle one if odd); NaN if none
+
+    Unlike the median it is always one of the values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    counts = (~np.isnan(values)).sum(axis=1)
+    if values.shape[1] == 0:
+        return np.full(len(values), np.nan)
+    # NaN sorts last, so the first ``counts`` entries of each row are the values
+    middle = np.take_along_axis(np.sort(values, axis=1), np.maximum(counts - 1, 0)[:, None] // 2, axis=1)[:, 0]
+    return np.where(counts > 0, middle, np.nan)
+
+
+class LineHistory:
+    """Append-only quote changes with the latest quote per (event, book)
+
+    Events and books are addressed by integer ids assigned on first sight;
+    ``event_keys`` / ``book_keys`` map them back, ``event_teams`` holds
+    the (home, away) abbreviations of each event and ``event_dates`` its
+    local start date ("" when the quotes gave none).
+    """
+
+    def __init__(self, capacity=1024):
+        self.event_ids = {}
+        self.event_keys = []
+        self.event_teams = []
+        self.event_dates = []
+        self.book_ids = {}
+        self.book_keys = []
+        self._quotes = np.empty(capacity, dtype=QUOTE_DTYPE)
+        self._size = 0
+        # Row in _quotes of the latest quote per (event, book); -1 if none yet
+        self._latest = np.full((0, 0), -1, dtype=np.int64)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def quotes(self):
+        """Every recorded quote change, oldest first"""
+        return self._quotes[:self._size]
+
+    def _book_ids(self, keys):
+        ids = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            if key not in self.book_ids:
+                self.book_ids[key] = len(self.book_keys)
+                self.book_keys.append(key)
+            ids[i] = self.book_ids[key]
+        return ids
+
+    def _event_ids(self, keys, home, away, dates):
+        ids = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            if key not in self.event_ids:
+                self.event_ids[key] = len(self.event_keys)
+                self.event_keys.append(key)
+                self.event_teams.append((home[i], away[i]))
+                self.event_dates.append(dates[i] if dates is not None else "")
+            ids[i] = self.event_ids[key]
+        return ids
+
+    def record(self, quotes, time):
+        """Store the quotes that differ from the latest ones; returns the ids of events that moved
+
+        ``quotes`` is a mapping of equal-length sequences: ``event``, ``home``,
+        ``away``, ``book``, ``point``, ``home_price`` and ``away_price``, plus
+        an optional ``date``, as returned by ``mlb_predictor.ingest.parse_quotes``.
+        """
+        events = self._event_ids(quotes["event"], quotes["home"], quotes["away"], quotes.get("date"))
+        books = self._book_ids(quotes["book"])
+        self._grow_latest()
+
+        point = np.asarray(quotes["point"], dtype=np.float32)
+        home_price = np.asarray(quotes["home_price"], dtype=np.int32)
+        away_price = np.asarray(quotes["away_price"], dtype=np.int32)
+
+        latest = self._latest[events, books]
+        previous = self._quotes[np.maximum(latest, 0)]
+        changed = (
+            (latest < 0)
+            | (previous["point"] != point)
+            | (previous["home_price"] != home_price)
+            | (previous["away_price"] != away_price)
+        )
+        n_changed = int(changed.sum())
+        self._reserve(self._size + n_changed)
+        rows = self._quotes[self._size:self._size + n_changed]
+        rows["event"] = events[changed]
+        rows["book"] = books[changed]
+        rows["time"] = np.datetime64(time, "s")
+        rows["point"] = point[changed]
+        rows["home_price"] = home_price[changed]
+        rows["away_price"] = away_price[changed]
+        self._latest[events[changed], books[changed]] = np.arange(self._size, self._size + n_changed)
+        self._size += n_changed
+        return np.unique(events[changed])
+
+    def _grow_latest(self):
+        shape = (len(self.event_keys), len(self.book_keys))
+        if shape != self._latest.shape:
+            latest = np.full(shape, -1, dtype=np.int64)
+            latest[:self._latest.shape[0], :self._latest.shape[1]] = self._latest
+            self._latest = latest
+
+    def _reserve(self, size):
+        if size > len(self._quotes):
+            quotes = np.empty(max(size, 2 * len(self._quotes)), dtype=QUOTE_DTYPE)
+            quotes[:self._size] = self._quotes[:self._size]
+            self._quotes = quotes
+
+    def event_game(self, event):
+        """(home, away, date) of an event id, the key games are matched on"""
+        return (*self.event_teams[event], self.event_dates[event])
+
+    def movement(self, event):
+        """Quote changes for one event id, oldest first"""
+        quotes = self.quotes
+        return quotes[quotes["event"] == event]
+
+    def market(self, events=None):
+        """Consensus line, best home price there and no-vig home probability per event
+
+        Returns a dict of arrays aligned with ``events`` (all events if None).
+        The consensus line is the lower median of the home points offered
+        across books, so always a line some book quotes (books split between
+        -1.5 and +1.5 give -1.5, not 0); price, probability and overround use
+        only the books quoting that line. ``books`` is 0 for events with no
+        quotes, whose point and price are NaN.
+        """
+        events = np.arange(len(self.event_keys)) if events is None else np.asarray(events)
+        latest = self._latest[events]
+        quotes = self._quotes[np.maximum(latest, 0)]
+        quoted = latest >= 0
+
+        point = np.where(quoted, quotes["point"], np.nan)
+        consensus = lower_median(point)
+        at_line = quoted & (point == consensus[:, None])
+        books = at_line.sum(axis=1)
+
+        home_price = np.where(at_line, quotes["home_price"], -100)
+        away_price = np.where(at_line, quotes["away_price"], -100)
+        home_fair, _, overround = remove_vig(implied_probability(home_price), implied_probability(away_price))
+        best_decimal = np.where(at_line, american_to_decimal(home_price), 0).max(axis=1, initial=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "event": events,
+                "point": consensus,
+                "home_price": np.where(books > 0, np.round(decimal_to_american(best_decimal)), np.nan),
+                "home_fair": np.where(at_line, home_fair, 0).sum(axis=1) / books,
+                "overround": np.where(at_line, overround, 0).sum(axis=1) / books,
+                "books": books,
+            }
@@ -0,0 +1,81 @@
+"""Scoring path of a fitted MLBPredictor: scaler and members composed, float32 throughout
+
+Feature matrices are float32 from construction on. ``ScoringPipeline``
+standard-scales them in place into a float32 buffer it keeps between calls
+(growing it only for a larger batch than any before, up to
+``MAX_BUFFER_ROWS``), and hands that buffer straight to the members. Larger
+batches are scaled into an array of their own, freed with the call, so one
+big batch does not pin its memory for the life of the pipeline. Scoring a slate allocates no scaled copy, and the
+forest, which works in float32 natively, no longer converts its input.
+Members with ``raw_features`` get the unscaled rows, and members with
+``takes_spreads`` get each row's home line when the caller has one.
+
+Training scales with the same ``scale_into``, so scaled values are
+bit-identical between fit and inference.
+"""
+import threading
+
+import numpy as np
+
+FEATURE_DTYPE = np.float32
+# Largest batch scaled into the kept buffer: a season's slate with room to spare
+MAX_BUFFER_ROWS = 4096
+
+
+def scale_into(X, scaler, out):
+    """Standard-scale ``X`` with a fitted StandardScaler into ``out``; returns ``out``
+
+    ``out`` may be ``X`` itself. Arithmetic is in float64, rounded once per
+    step to ``out``'s dtype.
+    """
+    np.subtract(X, scaler.mean_, out=out, casting="same_kind")
+    np.divide(out, scaler.scale_, out=out, casting="same_kind")
+    return out
+
+
+def scaled_copy(X, scaler):
+    """``X`` scaled as a new float32 array: the one copy training needs"""
+    return scale_into(X, scaler, np.empty(np.shape(X), dtype=FEATURE_DTYPE))
+
+
+class ScoringPipeline:
+    """A fitted scaler and weighted ensemble members, scored as one step
+
+    ``members`` is a list of (estimator, weight). ``model_key`` records the
+    fitted state it was built from, so owners can tell when to rebuild it.
+    """
+
+    def __init__(self, scaler, members, model_key=None):
+        self.scaler = scaler
+        self.members = members
+        self.model_key = model_key
+        self._raw = [getattr(estimator, "raw_features", False) for estimator, _ in members]
+        self._takes_spreads = [getattr(estimator, "takes_spreads", False) for estimator, _ in members]
+        self._buffer = np.empty((0, len(scaler.mean_)), dtype=FEATURE_DTYPE)
+        # The buffer is shared; one batch at a time
+        self._lock = threading.Lock()
+
+    def predict_proba(self, X, spreads=None):
+        """Weighted ensemble probability of the positive class for each row
+
+        ``spreads`` (each row's home line) is passed on to members that price it.
+        """
+        X = np.ascontiguousarray(X, dtype=FEATURE_DTYPE)
+        with self._lock:
+            X_scaled = None
+            if not all(self._raw):
+                if len(X) > MAX_BUFFER_ROWS:
+                    X_scaled = scaled_copy(X, self.scaler)
+                else:
+                    if len(X) > len(self._buffer):
+                        self._buffer = np.empty((len(X), X.shape[1]), dtype=FEATURE_DTYPE)
+                    X_scaled = scale_into(X, self.scaler, self._buffer[:len(X)])
+            probabilities = np.zeros(len(X))
+            for (estimator, weight), raw, takes_spreads in zip(self.members, self._raw, self._takes_spreads):
+                rows = X if raw else X_scaled
+                if takes_spreads and spreads is not None:
+                    member = estimator.predict_proba(rows, spreads)[:, 1]
+                else:
+                    member = estimator.predict_proba(rows)[:, 1]
+                probabilities += np.multiply(member, weight, out=member)
+        return probabilities
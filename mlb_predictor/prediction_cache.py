@@ -0,0 +1,90 @@
+"""Bounded LRU cache of ensemble probabilities per (model, feature row)
+
+The same slate is rescored on every scheduler refresh although neither the
+model nor the team stats have changed. ``PredictionCache`` sits in front of
+``MLBPredictor.predict_features``: rows already scored by the same model are
+answered from memory and only the rest reach the estimators, in one batch.
+
+Keys are the model's ``model_key`` (artifact version, or a fresh token after
+an in-memory fit or update) plus the row's raw float32 bytes (the dtype models score in),
+and the row's home line when one is given. Because the
+features embed the team stats, new data gives new keys, and the first lookup
+with a new model key drops every entry of the old one. One cache is thread
+safe and can be shared by every session in the process.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from mlb_predictor.pipeline import FEATURE_DTYPE
+
+DEFAULT_MAXSIZE = 50_000
+
+
+class PredictionCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.model_key = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self):
+        """Share of looked-up rows answered from the cache, or None before any lookup"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def lookup(self, model_key, features, predict, spreads=None):
+        """Probabilities for every row of ``features``, calling ``predict`` on the misses only
+
+        With ``spreads`` (one home line per row) a row is keyed on its line
+        too, and ``predict`` is given the missing rows' lines as well.
+        """
+        features = np.ascontiguousarray(features, dtype=FEATURE_DTYPE)
+        rows = features
+        if spreads is not None:
+            spreads = np.ascontiguousarray(spreads, dtype=np.float64)
+            # Each row's bytes followed by its line's, as one array
+            rows = np.concatenate([features.view(np.uint8), spreads[:, None].view(np.uint8)], axis=1)
+        keys = [row.tobytes() for row in rows]
+        probabilities = np.empty(len(keys))
+        missing = []
+
+        with self._lock:
+            if model_key != self.model_key:
+                # A new model makes every cached probability stale
+                self._entries.clear()
+                self.model_key = model_key
+            for i, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    probabilities[i] = value
+                    self._entries.move_to_end(key)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            if spreads is None:
+                probabilities[missing] = predict(features[missing])
+            else:
+                probabilities[missing] = predict(features[missing], spreads[missing])
+            with self._lock:
+                if model_key == self.model_key:
+                    for i in missing:
+                        self._entries[keys[i]] = probabilities[i]
+                        self._entries.move_to_end(keys[i])
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+        return probabilities
@@ -0,0 +1,134 @@
+"""Confidence tiers and betting edge shared by the app and batch consumers
+
+``prediction_frame`` is the post-processing stage for a scored slate: tiers,
+edges, spread labels, ordering and threshold filtering are computed with
+array operations, so a season costs about the same Python work as one game.
+Every column describes the home side's run line: its label, price, cover
+probability (confidence) and edge. Edges are measured against each game's
+actual price when the slate has one.
+Tiers and edges are for the run line; the moneyline and total probabilities
+ride along in their own columns when the slate was scored for every market.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from mlb_predictor.odds import implied_probability
+
+# Break-even probability (%) for a -110 run line, used when a game has no price
+IMPLIED_PROB = 52.4
+
+# (minimum confidence %, recommendation, card CSS class), highest tier first
+TIERS = [
+    (70, "STRONG BET", "strong-bet"),
+    (60, "GOOD BET", "good-bet"),
+    (55, "FAIR BET", "fair-bet"),
+]
+PASS_TIER = ("PASS", "pass-bet")
+
+# Tier lookup tables indexed by tier_index(); the last entry is PASS
+_THRESHOLDS = np.array([threshold for threshold, _, _ in TIERS])
+_RECOMMENDATIONS = np.array([name for _, name, _ in TIERS] + [PASS_TIER[0]], dtype=object)
+_CARD_CLASSES = np.array([card for _, _, card in TIERS] + [PASS_TIER[1]], dtype=object)
+
+COLUMNS = [
+    "matchup", "spread", "price", "confidence", "recommendation", "edge",
+    "home_win", "total", "over", "time", "card_class",
+]
+
+
+def tier_index(confidences):
+    """Position in TIERS of each confidence percentage, len(TIERS) for PASS (and NaN)"""
+    confidences = np.asarray(confidences, dtype=np.float64)
+    # argmax of an all-false row is 0, the top tier: below every threshold,
+    # NaN included (it compares false with all of them), is PASS instead
+    index = np.argmax(confidences[..., None] >= _THRESHOLDS, axis=-1)
+    return np.where(confidences >= _THRESHOLDS[-1], index, len(TIERS))
+
+
+def recommend(confidence):
+    """Recommendation label and card class for a confidence percentage"""
+    index = tier_index(confidence)
+    return _RECOMMENDATIONS[index], _CARD_CLASSES[index]
+
+
+def edge(confidence, implied_prob=IMPLIED_PROB):
+    """Percentage points of confidence above the break-even probability"""
+    return confidence - implied_prob
+
+
+def break_even(prices):
+    """Break-even probability (%) of each American price, IMPLIED_PROB where the price is NaN"""
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.isnan(prices), IMPLIED_PROB, implied_probability(prices) * 100)
+
+
+def matchup_labels(teams, home_ids, away_ids):
+    """"AWAY @ HOME" for arrays of team ids, formatted once per team pair"""
+    teams = np.asarray(teams, dtype=str)
+    pairs = np.char.add(np.char.add(teams[:, None], " @ "), teams[None, :])
+    return pairs[away_ids, home_ids]
+
+
+def spread_labels(teams, home_ids, spread):
+    """Home run-line text, e.g. "NYY -1.5" or "TOR +1.5", for arrays of games
+
+    Always the home side: the price, confidence and edge next to it are the
+    home side's too.
+    """
+    teams = np.asarray(teams, dtype=str)
+    # Only a handful of distinct lines: format each once
+    lines, inverse = np.unique(spread, return_inverse=True)
+    labels = np.array([f"{line:+g}" for line in lines], dtype=str)
+    return np.char.add(np.char.add(teams[home_ids], " "), labels[inverse.reshape(-1)])
+
+
+def prediction_columns(games, teams, probabilities, min_confidence=None):
+    """Display columns for a scored slate as arrays, highest confidence first
+
+    ``games`` is a slate array, ``teams`` the abbreviations its ids index and
+    ``probabilities`` the run-line probability of each game, or the dict of
+    every market from MLBPredictor.predict_markets. Confidence is the
+    run-line probability (%); ``home_win`` and ``over`` (%) are NaN unless
+    their markets were given. Games below ``min_confidence`` are dropped
+    when it is given.
+    """
+    if not isinstance(probabilities, Mapping):
+        probabilities = {"run_line": probabilities}
+    unpriced = np.full(len(games), np.nan)
+    confidence = np.asarray(probabilities["run_line"], dtype=np.float64) * 100
+    home_win = np.asarray(probabilities.get("moneyline", unpriced), dtype=np.float64) * 100
+    over = np.asarray(probabilities.get("total", unpriced), dtype=np.float64) * 100
+    order = np.argsort(-confidence, kind="stable")  # equal confidences keep slate order
+    if min_confidence is not None:
+        order = order[confidence[order] >= min_confidence]
+
+    games = games[order]
+    confidence = confidence[order]
+    tiers = tier_index(confidence)
+    return {
+        "matchup": matchup_labels(teams, games["home"], games["away"]),
+        "spread": spread_labels(teams, games["home"], games["spread"]),
+        "price": games["price"],
+        "confidence": confidence,
+        "recommendation": _RECOMMENDATIONS[tiers],
+        "edge": edge(confidence, break_even(games["price"])),
+        "home_win": home_win[order],
+        "total": games["total"],
+        "over": over[order],
+        "time": games["time"],
+        "card_class": _CARD_CLASSES[tiers],
+    }
+
+
+def prediction_frame(games, teams, probabilities, min_confidence=None):
+    """prediction_columns() as a DataFrame, for batch and backtest reports"""
+    return pd.DataFrame(prediction_columns(games, teams, probabilities, min_confidence), columns=COLUMNS)
+
+
+def build_predictions(games, teams, probabilities, min_confidence=None):
+    """prediction_columns() as a list of row dicts, for the app's snapshot"""
+    columns = prediction_columns(games, teams, probabilities, min_confidence)
+    return [dict(zip(COLUMNS, row)) for row in zip(*(columns[name].tolist() for name in COLUMNS))]
@@ -0,0 +1,135 @@
+"""Background worker that precomputes predictions outside the request path
+
+``PredictionScheduler`` runs in a daemon thread. Every ``interval`` seconds it
+refreshes the slate and team stats, loads the latest artifact, scores the
+slate for every market (the ensemble through a shared ``PredictionCache``, so
+unchanged games are not rescored) and swaps in a new immutable
+``PredictionSnapshot``. Readers only ever take the current snapshot
+reference, so page renders never wait on models.
+
+The worker trains only on synthetic data. It publishes a bootstrap artifact
+when none exists, and replaces the latest one once it is older than
+``retrain_after`` only if that one was trained on synthetic data too. Models
+trained on real games (``train --games``, ``--shards``) are never replaced
+here: keeping them current is the job of ``train --incremental``, and a stale
+one is logged and kept.
+With a ``LiveOdds`` stream attached, each refresh also hands it the slate and
+probabilities, and line moves between refreshes are pushed by the stream.
+
+Data, model and post-processing modules (NumPy, pandas, scikit-learn) are
+imported on the worker thread, so importing this module stays cheap for the
+app.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PredictionSnapshot:
+    """One published set of predictions and the model that produced them"""
+    created_at: datetime
+    artifact_version: str
+    predictions: tuple
+    rf_accuracy: float
+    svm_accuracy: float
+    cache_hit_ratio: float = None
+
+
+class PredictionScheduler(threading.Thread):
+    """Daemon thread that keeps ``snapshot`` current"""
+
+    def __init__(self, models_dir="models", interval=15 * 60, retrain_after=timedelta(days=1),
+                 load_games=None, load_team_stats=None, cache=None, live=None):
+        super().__init__(name="prediction-scheduler", daemon=True)
+        self.models_dir = models_dir
+        self.interval = interval
+        self.retrain_after = retrain_after
+        self.load_games = load_games
+        self.load_team_stats = load_team_stats
+        # Created on the worker thread unless given, to keep NumPy off the import path
+        self.cache = cache
+        # Optional mlb_predictor.live.LiveOdds that reprices the slate as lines move
+        self.live = live
+        self.snapshot = None
+        self.last_error = None
+        # Set once the first refresh has finished, successfully or not
+        self.ready = threading.Event()
+        self._predictor = None
+        # Stale non-synthetic artifact already warned about
+        self._stale_version = None
+        self._stopping = threading.Event()
+
+    def _current_predictor(self):
+        from mlb_predictor.model import MLBPredictor, latest_artifact_version, latest_config, load_latest
+        from mlb_predictor.prediction_cache import PredictionCache
+
+        if self.cache is None:
+            self.cache = PredictionCache()
+
+        version = latest_artifact_version(self.models_dir)
+        if self._predictor is None or self._predictor.artifact_version != version:
+            self._predictor = load_latest(self.models_dir)
+
+        if self._predictor is None:
+            logger.info("No artifact in %s; training a bootstrap model on synthetic data", self.models_dir)
+            retrain = True
+        else:
+            stale = datetime.now(timezone.utc) - self._predictor.created_at >= self.retrain_after
+            retrain = stale and self._predictor.training_source == "synthetic"
+            if stale and not retrain and self._stale_version != version:
+                logger.warning("Artifact %s is older than %s; serving it until the next train run",
+                               version, self.retrain_after)
+                self._stale_version = version
+        if retrain:
+            predictor = MLBPredictor(**latest_config(self.models_dir))
+            predictor.train_models()
+            predictor.save(self.models_dir)
+            self._predictor = predictor
+        self._predictor.cache = self.cache
+        return self._predictor
+
+    def refresh(self):
+        """Rebuild and publish a snapshot now; returns it"""
+        from mlb_predictor.data import get_team_stats, get_todays_games
+        from mlb_predictor.recommendations import build_predictions
+
+        predictor = self._current_predictor()
+        games = (self.load_games or get_todays_games)()
+        team_stats = (self.load_team_stats or get_team_stats)()
+        markets = predictor.predict_markets(games, team_stats)
+        if self.live is not None:
+            self.live.load(games, team_stats.teams, markets)
+
+        self.snapshot = PredictionSnapshot(
+            created_at=datetime.now(),
+            artifact_version=predictor.artifact_version,
+            predictions=tuple(
+                MappingProxyType(prediction)
+                for prediction in build_predictions(games, team_stats.teams, markets)
+            ),
+            rf_accuracy=predictor.rf_accuracy,
+            svm_accuracy=predictor.svm_accuracy,
+            cache_hit_ratio=self.cache.hit_ratio,
+        )
+        return self.snapshot
+
+    def run(self):
+        while not self._stopping.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as exc:
+                # Keep serving the last good snapshot and try again next interval
+                logger.exception("Prediction refresh failed")
+                self.last_error = exc
+            self.ready.set()
+            self._stopping.wait(self.interval)
+
+    def stop(self):
+        """Ask the worker to exit after the current refresh"""
+        self._stopping.set()
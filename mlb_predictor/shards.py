@@ -0,0 +1,126 @@
+"""Training sets stored as shards on disk, read without loading them whole
+
+A shard directory holds ``shards.json`` (format, feature names and each
+shard's row count) and one file or file pair per shard:
+
+* ``npy``: ``<name>.X.npy`` / ``<name>.y.npy``, memory-mapped on read.
+* ``arrow``: an uncompressed Arrow IPC file, memory-mapped on read. Features
+  are one fixed-size-list column, so its values buffer is already the
+  row-major feature matrix and reading it copies nothing.
+* ``parquet``: one Parquet file with a column per feature, read one shard at
+  a time (Parquet cannot be memory-mapped).
+
+``ShardDataset`` addresses the rows of every shard by one global index, in
+shard order, so time-ordered splits are index ranges and batches are views.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+SHARD_MANIFEST = "shards.json"
+SHARD_FORMATS = ["npy", "arrow", "parquet"]
+# Label column of Arrow and Parquet shards, and the Arrow feature-matrix column
+TARGET_COLUMN = "covered"
+FEATURES_COLUMN = "features"
+# Rows handed to training code at a time
+BATCH_ROWS = 100_000
+
+
+def shard_files(name, fmt):
+    """File names making up shard ``name``"""
+    if fmt == "npy":
+        return [f"{name}.X.npy", f"{name}.y.npy"]
+    return [f"{name}.{fmt}"]
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, SHARD_MANIFEST)) as f:
+        return json.load(f)
+
+
+def shards_version(directory):
+    """Short fingerprint of a shard set, standing in for data_version() of its rows"""
+    with open(os.path.join(directory, SHARD_MANIFEST), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_shard(directory, manifest, shard, mmap_mode="r"):
+    """(X, y) of one manifest entry; memory-mapped for npy and Arrow unless mmap_mode is None"""
+    paths = [os.path.join(directory, file) for file in shard_files(shard["name"], manifest["format"])]
+    if manifest["format"] == "npy":
+        return np.load(paths[0], mmap_mode=mmap_mode), np.load(paths[1], mmap_mode=mmap_mode)
+    if manifest["format"] == "arrow":
+        import pyarrow as pa
+
+        source = pa.memory_map(paths[0]) if mmap_mode is not None else pa.OSFile(paths[0])
+        table = pa.ipc.open_file(source).read_all()
+        features = table.column(FEATURES_COLUMN).combine_chunks()
+        X = features.flatten().to_numpy(zero_copy_only=mmap_mode is not None)
+        return X.reshape(-1, len(manifest["features"])), table.column(TARGET_COLUMN).to_numpy()
+
+    import pandas as pd
+
+    frame = pd.read_parquet(paths[0])
+    return frame[manifest["features"]].to_numpy(), frame[TARGET_COLUMN].to_numpy()
+
+
+def iter_shards(directory, mmap_mode="r"):
+    """Yield (X, y) per shard, in order"""
+    manifest = read_manifest(directory)
+    for shard in manifest["shards"]:
+        yield load_shard(directory, manifest, shard, mmap_mode)
+
+
+def split_index(n_rows, test_fraction):
+    """First row of the held-out tail when the last ``test_fraction`` of rows is held out"""
+    return n_rows - int(n_rows * test_fraction)
+
+
+class ShardDataset:
+    """The rows of a shard directory as one time-ordered sequence"""
+
+    def __init__(self, directory, mmap_mode="r"):
+        self.directory = directory
+        self.mmap_mode = mmap_mode
+        self.manifest = read_manifest(directory)
+        # Global index of each shard's first row, plus the total
+        self.offsets = np.concatenate([[0], np.cumsum([shard["rows"] for shard in self.manifest["shards"]])])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    @property
+    def version(self):
+        return shards_version(self.directory)
+
+    def _ranges(self, start, stop, batch_rows):
+        """(shard, first row, last row + 1) within each shard, in batches that never span shards"""
+        stop = len(self) if stop is None else stop
+        for index, shard in enumerate(self.manifest["shards"]):
+            low, high = max(start, self.offsets[index]), min(stop, self.offsets[index + 1])
+            first = self.offsets[index]
+            for batch_start in range(low, high, batch_rows):
+                yield index, batch_start - first, min(batch_start + batch_rows, high) - first
+
+    def n_batches(self, start=0, stop=None, batch_rows=BATCH_ROWS):
+        return sum(1 for _ in self._ranges(start, stop, batch_rows))
+
+    def batches(self, start=0, stop=None, batch_rows=BATCH_ROWS):
+        """Yield (X, y) views of rows [start, stop) in batches of at most ``batch_rows``
+
+        Only the shard being read is open; for memory-mapped formats the
+        batches are views, so rows are paged in as they are used.
+        """
+        opened, X, y = None, None, None
+        for index, low, high in self._ranges(start, stop, batch_rows):
+            if index != opened:
+                X, y = load_shard(self.directory, self.manifest, self.manifest["shards"][index], self.mmap_mode)
+                opened = index
+            yield X[low:high], y[low:high]
+
+    def rows(self, start, stop):
+        """Rows [start, stop) as in-memory arrays, for ranges small enough to hold"""
+        batches = list(self.batches(start, stop, max(1, stop - start)))
+        return np.concatenate([X for X, _ in batches]), np.concatenate([y for _, y in batches])
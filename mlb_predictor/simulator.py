@@ -0,0 +1,211 @@
+"""Monte Carlo run-line simulator
+
+Each team's runs are drawn from a negative binomial (Poisson when
+``dispersion`` is None) whose mean is the team's runs per game scaled by the
+opponent's runs allowed relative to the league. The home-minus-away margin
+of every draw is compared with any number of lines at once, so one batch of
+draws prices the standard line and the alternates alike. Tied draws stand in
+for extra innings and go to either side by one run.
+
+Draws use common random numbers: one set of uniforms, mapped through each
+game's run distribution by inverse CDF. A game's probability therefore
+depends only on its own inputs and the seed, not on what else is in the
+batch, and differences between games carry less simulation noise.
+
+``RunLineSimulator`` wraps this as an ensemble member. It reads raw (unscaled)
+feature rows, which ``MLBPredictor`` passes to members with ``raw_features``,
+and prices each game at its own line, which it passes to members with
+``takes_spreads``.
+
+``market_probabilities`` prices the moneyline and the total from the same
+run distributions without drawing at all: with at most MAX_RUNS runs a side,
+each game's joint score distribution is a small table, summed exactly.
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from mlb_predictor.model import FEATURE_NAMES
+
+LEAGUE_RUNS = 4.5
+# Variance = mean + mean**2 / DISPERSION; MLB run totals are overdispersed
+DISPERSION = 4.0
+# Share of extra-inning games won by the home team
+HOME_EXTRA_INNINGS = 0.52
+# Run totals simulated: 0 .. MAX_RUNS - 1 (more is vanishingly rare)
+MAX_RUNS = 30
+# Game x draw cells per chunk, to bound memory for large batches
+CHUNK_CELLS = 4_000_000
+
+_COLUMNS = [FEATURE_NAMES.index(name) for name in (
+    "home_runs_per_game", "away_runs_per_game", "home_era", "away_era",
+)]
+
+
+def expected_runs(home_rpg, away_rpg, home_era, away_era, league_runs=LEAGUE_RUNS):
+    """Mean runs for each side: own scoring rate times opponent's runs allowed vs league"""
+    home = np.asarray(home_rpg, dtype=np.float64) * np.asarray(away_era) / league_runs
+    away = np.asarray(away_rpg, dtype=np.float64) * np.asarray(home_era) / league_runs
+    return home, away
+
+
+def run_cdf(means, dispersion=DISPERSION):
+    """CDF over 0 .. MAX_RUNS - 1 runs for each mean, shape (len(means), MAX_RUNS)"""
+    means = np.maximum(np.asarray(means, dtype=np.float64), 1e-6)
+    k = np.arange(1, MAX_RUNS)
+    if dispersion is None:
+        first = np.exp(-means)
+        ratio = means[:, None] / k
+    else:
+        p = dispersion / (dispersion + means)
+        first = p ** dispersion
+        ratio = (k - 1 + dispersion) / k * (1 - p[:, None])
+    pmf = np.concatenate([first[:, None], first[:, None] * np.cumprod(ratio, axis=1)], axis=1)
+    return np.cumsum(pmf, axis=1)
+
+
+class Draws:
+    """Shared uniforms, pre-sorted so that mapping them through a CDF is a cumsum
+
+    Draws are kept in order of the home uniform, so a home run total rises by
+    one wherever the uniforms pass one of the game's CDF values: a
+    searchsorted of MAX_RUNS values instead of one per draw. Away uniforms
+    are sorted the same way and their totals gathered back into draw order.
+    """
+
+    def __init__(self, n_draws, seed=None):
+        uniforms = np.random.default_rng(seed).random((3, n_draws))
+        home_order = np.argsort(uniforms[0])
+        home, away, extra = uniforms[:, home_order]
+        self.n_draws = n_draws
+        away_order = np.argsort(away)
+        self.away_rank = np.argsort(away_order)
+        self.sorted = (home, away[away_order])
+        self.extra_innings = np.where(extra < HOME_EXTRA_INNINGS, 1, -1).astype(np.int8)
+
+    def _cumulative_runs(self, side, cdf):
+        steps = np.searchsorted(self.sorted[side], cdf[:, :-1])
+        increments = np.zeros((len(cdf), self.n_draws + 1), dtype=np.int8)
+        rows = np.broadcast_to(np.arange(len(cdf))[:, None], steps.shape)
+        np.add.at(increments, (rows, steps), 1)
+        return np.cumsum(increments[:, :-1], axis=1, dtype=np.int8)
+
+    def margins(self, home_cdf, away_cdf):
+        """Home-minus-away margins, shape (games, draws); tied draws are settled by one run"""
+        margins = self._cumulative_runs(0, home_cdf)
+        margins -= np.take(self._cumulative_runs(1, away_cdf), self.away_rank, axis=1)
+        margins += (margins == 0) * self.extra_innings
+        return margins
+
+
+def cover_probability(home_rpg, away_rpg, home_era, away_era, spreads, n_draws=100_000,
+                      dispersion=DISPERSION, league_runs=LEAGUE_RUNS, seed=None):
+    """Probability the home side covers each line, for a whole slate
+
+    ``spreads`` holds home lines: one per game (shape (games,)) or several
+    per game (shape (games, lines)), and the result has the same shape. A
+    fixed ``seed`` makes results reproducible.
+    """
+    draws = Draws(n_draws, seed)
+    home_mean, away_mean = expected_runs(home_rpg, away_rpg, home_era, away_era, league_runs)
+    spreads = np.asarray(spreads, dtype=np.float64)
+    lines = spreads.reshape(len(home_mean), -1)
+    # Margins are whole runs, so covering (margin + line > 0) is margin > floor(-line)
+    thresholds = np.clip(np.floor(-lines), -MAX_RUNS, MAX_RUNS).astype(np.int8)
+    probabilities = np.empty(lines.shape)
+
+    chunk = max(1, CHUNK_CELLS // n_draws)
+    for start in range(0, len(home_mean), chunk):
+        stop = start + chunk
+        margins = draws.margins(run_cdf(home_mean[start:stop], dispersion), run_cdf(away_mean[start:stop], dispersion))
+        for line in range(lines.shape[1]):
+            covers = np.count_nonzero(margins > thresholds[start:stop, line, None], axis=1)
+            probabilities[start:stop, line] = covers / n_draws
+    return probabilities.reshape(spreads.shape)
+
+
+def run_pmf(means, dispersion=DISPERSION):
+    """Probability of 0 .. MAX_RUNS - 1 runs, the tail folded into the last, as ``Draws`` assigns it"""
+    cdf = run_cdf(means, dispersion)
+    cdf[:, -1] = 1
+    return np.diff(cdf, axis=1, prepend=0)
+
+
+# Margin and total of every (home runs, away runs) cell, extra-inning tiebreaker included
+_RUNS = np.arange(MAX_RUNS)
+_TIED = _RUNS[:, None] == _RUNS[None, :]
+_TOTALS = (_RUNS[:, None] + _RUNS[None, :] + _TIED).ravel()
+# Sums a flattened joint table into total runs: (MAX_RUNS ** 2, 2 * MAX_RUNS)
+_TOTAL_INDICATOR = (_TOTALS[:, None] == np.arange(2 * MAX_RUNS)).astype(np.float64)
+
+
+def market_probabilities(home_rpg, away_rpg, home_era, away_era, totals, dispersion=DISPERSION,
+                         league_runs=LEAGUE_RUNS):
+    """Home win and over probabilities per game, exactly, under the simulator's run model
+
+    ``totals`` holds each game's over/under line; a game landing on the line
+    (a push) is not over, and a NaN line gives a NaN probability. Tied scores
+    go to extra innings as in ``Draws``: the home side wins
+    HOME_EXTRA_INNINGS of them, and the winning run adds one to the total.
+    Returns ``{"moneyline": ..., "total": ...}``.
+    """
+    home_mean, away_mean = expected_runs(home_rpg, away_rpg, home_era, away_era, league_runs)
+    home_pmf, away_pmf = run_pmf(home_mean, dispersion), run_pmf(away_mean, dispersion)
+    # P(home runs > away runs) and P(tied), without the (games, MAX_RUNS, MAX_RUNS) table
+    away_below = np.cumsum(away_pmf, axis=1) - away_pmf
+    home_ahead = np.einsum("gi,gi->g", home_pmf, away_below)
+    tied = np.einsum("gi,gi->g", home_pmf, away_pmf)
+
+    joint = (home_pmf[:, :, None] * away_pmf[:, None, :]).reshape(len(home_mean), -1)
+    total_cdf = np.cumsum(joint @ _TOTAL_INDICATOR, axis=1)
+    lines = np.asarray(totals, dtype=np.float64)
+    known = ~np.isnan(lines)
+    # Totals are whole runs, so over (total > line) is total > floor(line)
+    thresholds = np.clip(np.floor(np.where(known, lines, 0)), -1, 2 * MAX_RUNS - 1).astype(np.intp)
+    under = np.where(thresholds >= 0, total_cdf[np.arange(len(lines)), np.maximum(thresholds, 0)], 0)
+    return {
+        "moneyline": home_ahead + HOME_EXTRA_INNINGS * tied,
+        "total": np.where(known, 1 - under, np.nan),
+    }
+
+
+class RunLineSimulator(ClassifierMixin, BaseEstimator):
+    """Ensemble member pricing each game's home run line by simulation
+
+    Feature rows carry no line: ``predict_proba`` takes the games' home lines
+    as ``spreads``, and prices games without one (no ``spreads``, or NaN) at
+    ``spread`` (-1.5: home favored by a run and a half). Fitting only estimates the
+    league scoring level from the training rows. Fewer draws than
+    ``cover_probability`` uses by default keep scoring a season quick; the
+    standard error stays under half a percentage point.
+    """
+    raw_features = True
+    takes_spreads = True
+
+    def __init__(self, spread=-1.5, n_draws=20_000, dispersion=DISPERSION, random_state=42):
+        self.spread = spread
+        self.n_draws = n_draws
+        self.dispersion = dispersion
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X = np.asarray(X)
+        self.classes_ = np.array([0, 1])
+        self.league_runs_ = float(X[:, _COLUMNS[:2]].mean())
+        return self
+
+    def predict_proba(self, X, spreads=None):
+        X = np.asarray(X)
+        if spreads is None:
+            spreads = np.full(len(X), self.spread)
+        else:
+            spreads = np.asarray(spreads, dtype=np.float64)
+            spreads = np.where(np.isnan(spreads), self.spread, spreads)
+        cover = cover_probability(
+            *(X[:, column] for column in _COLUMNS), spreads,
+            n_draws=self.n_draws, dispersion=self.dispersion,
+            league_runs=self.league_runs_, seed=self.random_state,
+        )
+        return np.column_stack([1 - cover, cover])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
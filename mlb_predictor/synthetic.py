@@ -0,0 +1,154 @@
+"""Synthetic training games, generated in chunks and optionally written as shards
+
+Chunk ``i`` of a dataset draws from its own ``np.random.Generator``, seeded
+from ``SeedSequence(seed, spawn_key=(i,))``. Chunks are therefore
+independent and reproducible whatever order (or process) they are made in,
+and nothing touches NumPy's global random state. Tens of millions of rows
+are produced one chunk at a time:
+
+    python -m mlb_predictor.synthetic data/synthetic --rows 50000000 --jobs 4
+
+Each chunk is written as one shard in any of the formats of
+``mlb_predictor.shards``, which also reads them back without loading the
+whole set.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from mlb_predictor.model import FEATURE_NAMES
+from mlb_predictor.pipeline import FEATURE_DTYPE
+from mlb_predictor.shards import FEATURES_COLUMN, SHARD_FORMATS, SHARD_MANIFEST, TARGET_COLUMN, shard_files
+
+DEFAULT_SEED = 42
+CHUNK_ROWS = 1_000_000
+
+
+def chunk_rng(seed, index):
+    """Generator for chunk ``index``: the index-th child of ``SeedSequence(seed)``"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def chunk_sizes(n_samples, chunk_rows=CHUNK_ROWS):
+    """Row counts of the chunks making up ``n_samples`` rows"""
+    full, rest = divmod(n_samples, chunk_rows)
+    return [chunk_rows] * full + ([rest] if rest else [])
+
+
+def synthetic_chunk(n_rows, rng):
+    """Features (float32, in FEATURE_NAMES order) and home-cover labels for ``n_rows`` games"""
+    home_win_pct = rng.normal(0.5, 0.15, n_rows)
+    away_win_pct = rng.normal(0.5, 0.15, n_rows)
+    home_runs_per_game = rng.normal(4.5, 1.0, n_rows)
+    away_runs_per_game = rng.normal(4.5, 1.0, n_rows)
+    home_era = rng.normal(4.0, 0.8, n_rows)
+    away_era = rng.normal(4.0, 0.8, n_rows)
+
+    # Written column by column: no float64 copy of the whole matrix
+    features = np.empty((n_rows, len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+    for column, values in enumerate([
+        home_win_pct, away_win_pct,
+        home_runs_per_game, away_runs_per_game,
+        home_era, away_era,
+        rng.normal(0, 0.1, n_rows),
+        rng.normal(0, 0.05, n_rows),
+    ]):
+        features[:, column] = values
+
+    prob_cover = (
+        0.3
+        + 0.3 * (home_win_pct - away_win_pct)
+        + 0.2 * (away_era - home_era) / 2
+        + 0.1 * (home_runs_per_game - away_runs_per_game) / 2
+        + 0.1 * rng.normal(0, 0.1, n_rows)
+    )
+    targets = rng.binomial(1, np.clip(prob_cover, 0.1, 0.9), n_rows)
+    return features, targets
+
+
+def iter_chunks(n_samples, chunk_rows=CHUNK_ROWS, seed=DEFAULT_SEED):
+    """Yield (X, y) chunks totalling ``n_samples`` rows"""
+    for index, n_rows in enumerate(chunk_sizes(n_samples, chunk_rows)):
+        yield synthetic_chunk(n_rows, chunk_rng(seed, index))
+
+
+def generate(n_samples, chunk_rows=CHUNK_ROWS, seed=DEFAULT_SEED):
+    """All ``n_samples`` rows as one (X, y) pair, for datasets that fit in memory"""
+    chunks = list(iter_chunks(n_samples, chunk_rows, seed))
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate([X for X, _ in chunks]), np.concatenate([y for _, y in chunks])
+
+
+def write_shard(directory, index, n_rows, seed=DEFAULT_SEED, fmt="npy"):
+    """Generate chunk ``index`` and write it as one shard; returns the shard name"""
+    X, y = synthetic_chunk(n_rows, chunk_rng(seed, index))
+    name = f"shard-{index:05d}"
+    paths = [os.path.join(directory, file) for file in shard_files(name, fmt)]
+    # Write then rename so an interrupted run never leaves a truncated shard behind
+    if fmt == "npy":
+        for path, array in zip(paths, (X, y)):
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + ".tmp", path)
+    elif fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.table({
+            FEATURES_COLUMN: pa.FixedSizeListArray.from_arrays(pa.array(X.ravel()), X.shape[1]),
+            TARGET_COLUMN: y,
+        })
+        with pa.OSFile(paths[0] + ".tmp", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(paths[0] + ".tmp", paths[0])
+    else:
+        import pandas as pd
+
+        frame = pd.DataFrame(X, columns=FEATURE_NAMES).assign(**{TARGET_COLUMN: y})
+        frame.to_parquet(paths[0] + ".tmp", index=False)
+        os.replace(paths[0] + ".tmp", paths[0])
+    return name
+
+
+def write_shards(directory, n_samples, chunk_rows=CHUNK_ROWS, seed=DEFAULT_SEED, fmt="npy", n_jobs=1):
+    """Write a synthetic dataset as one shard per chunk, ``n_jobs`` at a time; returns the manifest"""
+    if fmt not in SHARD_FORMATS:
+        raise ValueError(f"Unknown shard format {fmt!r}; expected one of {SHARD_FORMATS}")
+    os.makedirs(directory, exist_ok=True)
+    sizes = chunk_sizes(n_samples, chunk_rows)
+    names = Parallel(n_jobs=n_jobs)(
+        delayed(write_shard)(directory, index, n_rows, seed, fmt) for index, n_rows in enumerate(sizes)
+    )
+    manifest = {
+        "format": fmt,
+        "rows": n_samples,
+        "chunk_rows": chunk_rows,
+        "seed": seed,
+        "features": FEATURE_NAMES,
+        "shards": [{"name": name, "rows": n_rows} for name, n_rows in zip(names, sizes)],
+    }
+    with open(os.path.join(directory, SHARD_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic training set as shards")
+    parser.add_argument("directory", help="where to write the shards and shards.json")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="games to generate")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="games per shard")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--format", choices=SHARD_FORMATS, default="npy")
+    parser.add_argument("--jobs", type=int, default=1, help="shards written in parallel")
+    args = parser.parse_args(argv)
+
+    manifest = write_shards(args.directory, args.rows, args.chunk_rows, args.seed, args.format, args.jobs)
+    print(f"Wrote {manifest['rows']} games in {len(manifest['shards'])} {args.format} shards "
+          f"to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
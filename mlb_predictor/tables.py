@@ -0,0 +1,112 @@
+"""Columnar team-stat and slate storage shared by the data sources and models
+
+Teams are addressed by integer id: their position in a team index, which is
+the canonical ``TEAMS`` list followed by any other abbreviations seen. Team
+stats live in a ``TeamTable`` (one contiguous float column per stat) and a
+slate is a NumPy structured array of ids, so building features for any number
+of games is a single fancy-index gather.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BOS", "CHC", "CWS", "CIN", "CLE", "COL", "DET",
+    "HOU", "KC", "LAA", "LAD", "MIA", "MIL", "MIN", "NYM", "NYY", "OAK",
+    "PHI", "PIT", "SD", "SEA", "SF", "STL", "TB", "TEX", "TOR", "WSH",
+]
+
+# Per-team stats the models use, in feature order
+TEAM_STATS = ["win_pct", "runs_per_game", "era"]
+
+# League-average stats used for a team with no data
+DEFAULT_TEAM_STATS = {"win_pct": 0.5, "runs_per_game": 4.5, "era": 4.0}
+
+# Markets priced for every game: home win, home run-line cover, over the total
+MARKETS = ["moneyline", "run_line", "total"]
+
+SLATE_DTYPE = np.dtype([
+    ("home", np.int32),
+    ("away", np.int32),
+    ("spread", np.float64),
+    ("time", "U10"),
+    # Local game date (YYYY-MM-DD) for matching odds; empty when unknown
+    ("date", "U10"),
+    # American odds on the home run line; NaN when unknown
+    ("price", np.float64),
+    # Over/under runs line; NaN when none is quoted
+    ("total", np.float64),
+])
+
+
+def team_index(games=()):
+    """Canonical teams followed by any other teams appearing in ``games``"""
+    known = set(TEAMS)
+    extra = {team for game in games for team in (game["home"], game["away"]) if team not in known}
+    return TEAMS + sorted(extra)
+
+
+class TeamTable(Mapping):
+    """Team stats as one contiguous column per stat, rows indexed by team id
+
+    Also reads like the ``{team: {stat: value}}`` dict it replaces, so
+    ``table["LAD"]["era"]`` keeps working for code that scores one game.
+    """
+
+    def __init__(self, teams, columns, values):
+        self.teams = list(teams)
+        self.columns = list(columns)
+        if self.columns[:len(TEAM_STATS)] != TEAM_STATS:
+            raise ValueError(f"TeamTable columns must start with {TEAM_STATS}")
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        # Fortran order keeps each stat contiguous
+        self.values = np.asfortranarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_dict(cls, team_stats, teams=None):
+        """Build from ``{team: {stat: value}}``; missing teams get league averages"""
+        teams = TEAMS if teams is None else teams
+        first = next(iter(team_stats.values()), DEFAULT_TEAM_STATS)
+        columns = TEAM_STATS + [name for name in first if name not in TEAM_STATS]
+        values = np.array([
+            [team_stats.get(team, DEFAULT_TEAM_STATS).get(name, np.nan) for name in columns]
+            for team in teams
+        ]).reshape(len(teams), len(columns))
+        return cls(teams, columns, values)
+
+    def ids(self, teams):
+        """Integer ids for a sequence of abbreviations"""
+        return np.array([self.index[team] for team in teams], dtype=np.int32)
+
+    def column(self, name):
+        """One stat for every team, as a contiguous array"""
+        return self.values[:, self.columns.index(name)]
+
+    def matchup_stats(self, home_ids, away_ids):
+        """Model stats for each matchup, shape (games, stats, 2) as (home, away)"""
+        pairs = np.stack([home_ids, away_ids], axis=1)
+        return self.values[pairs, :len(TEAM_STATS)].transpose(0, 2, 1)
+
+    def __getitem__(self, team):
+        row = self.values[self.index[team]]
+        return dict(zip(self.columns, row.tolist()))
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __len__(self):
+        return len(self.teams)
+
+
+def make_slate(games, teams=TEAMS):
+    """Structured slate array from game dicts, with ids from the ``teams`` index"""
+    index = {team: i for i, team in enumerate(teams)}
+    slate = np.zeros(len(games), dtype=SLATE_DTYPE)
+    slate["home"] = [index[game["home"]] for game in games]
+    slate["away"] = [index[game["away"]] for game in games]
+    slate["spread"] = [game["spread"] for game in games]
+    slate["time"] = [game.get("time", "") for game in games]
+    slate["date"] = [str(game.get("date") or "") for game in games]
+    slate["price"] = [game.get("price", np.nan) for game in games]
+    slate["total"] = [game.get("total", np.nan) for game in games]
+    return slate
@@ -0,0 +1,84 @@
+"""Offline training step: fit the ensemble and publish a model artifact
+
+Run before starting the app (or as part of a deploy) so the app only has to
+load the latest bundle:
+
+    python -m mlb_predictor.train --models-dir models
+
+Nightly, with the full game history, ``--incremental`` folds only the games
+added since the latest bundle into its models (full refits still happen
+periodically):
+
+    python -m mlb_predictor.train --games history.csv --incremental
+
+Datasets too large for memory, such as shards written by
+``mlb_predictor.synthetic``, are trained on out of core, in memory-mapped
+batches (see ``MLBPredictor.train_out_of_core``):
+
+    python -m mlb_predictor.train --shards data/synthetic --svm-member sgd_logistic
+"""
+import argparse
+
+import pandas as pd
+
+from mlb_predictor.features import build_training_set
+from mlb_predictor.members import MEMBERS, SVM_MEMBER_ENV
+from mlb_predictor.model import TRAIN_JOBS_ENV, MLBPredictor, data_version, latest_config, load_latest
+from mlb_predictor.shards import BATCH_ROWS, ShardDataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and save the MLB prediction models")
+    parser.add_argument("--models-dir", default="models", help="directory holding artifact bundles")
+    data = parser.add_mutually_exclusive_group()
+    data.add_argument("--games", help="CSV of completed games to train on instead of synthetic data")
+    data.add_argument("--shards", help="directory of training shards (see mlb_predictor.synthetic) to stream")
+    parser.add_argument("--svm-member", choices=sorted(MEMBERS),
+                        help=f"estimator for the SVM slot (default ${SVM_MEMBER_ENV} or svc)")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS,
+                        help="rows per batch when training on --shards")
+    parser.add_argument("--jobs", type=int, help=f"cores to train on (default ${TRAIN_JOBS_ENV} or all but one)")
+    parser.add_argument("--untuned", action="store_true",
+                        help="use default parameters and weights instead of the latest artifact's")
+    parser.add_argument("--incremental", action="store_true",
+                        help="update the latest bundle with the games it has not seen (needs --games)")
+    args = parser.parse_args(argv)
+    if args.incremental and not args.games:
+        parser.error("--incremental needs --games")
+
+    X = y = None
+    if args.games:
+        X, y, _ = build_training_set(pd.read_csv(args.games).to_dict("records"))
+
+    if args.incremental:
+        predictor = load_latest(args.models_dir, mmap_mode=None)
+        if predictor is not None and predictor.rows_seen == len(X):
+            print(f"{predictor.artifact_version} is up to date ({len(X)} games)")
+            return
+        if predictor is not None and predictor.rows_seen < len(X):
+            if args.jobs:
+                predictor.n_jobs = args.jobs
+            predictor.retrain(X, y, len(X) - predictor.rows_seen)
+            predictor.data_version = data_version(X, y)
+            predictor.training_source = "games"
+            bundle_dir = predictor.save(args.models_dir)
+            print(f"Saved {predictor.artifact_version} to {bundle_dir} "
+                  f"({'incremental update' if predictor.updates_since_refit else 'full refit'}, "
+                  f"{predictor.rows_seen} games)")
+            return
+
+    # Keep the tuned setup of the latest bundle unless it was for a different SVM member
+    config = {} if args.untuned else latest_config(args.models_dir)
+    if args.svm_member and args.svm_member != config.get("svm_member"):
+        config = {"svm_member": args.svm_member}
+    predictor = MLBPredictor(**config, n_jobs=args.jobs)
+    if args.shards:
+        rf_acc, svm_acc = predictor.train_out_of_core(ShardDataset(args.shards), batch_rows=args.batch_rows)
+    else:
+        rf_acc, svm_acc = predictor.train_models(X, y)
+    bundle_dir = predictor.save(args.models_dir)
+    print(f"Saved {predictor.artifact_version} to {bundle_dir} (RF {rf_acc:.1%}, SVM {svm_acc:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Offline hyperparameter and ensemble-weight search
+
+Each trial samples hyperparameters for both ensemble slots from
+``SEARCH_SPACES``. Trials are scored with time-series cross-validation (every
+fold trains on earlier rows and validates on the rows that follow) and pruned
+by successive halving: all trials run on the most recent fold, the best
+``1/eta`` go on to ``eta`` times as many folds, and so on until the survivors
+have seen every fold. For each trial the ensemble weight is the grid value
+with the lowest Brier score on the out-of-fold predictions, so weights cost
+no extra fits.
+
+Raw and scaled fold matrices are cached on disk per training set and memory-mapped
+by the workers. The winning configuration is trained the same way as by
+``mlb_predictor.train`` and published as a new artifact bundle; loading it,
+and later retraining from it, keep the tuned parameters and weights.
+
+    python -m mlb_predictor.tune --games 2023.csv --trials 27 --svm-member rbf_logistic
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+from mlb_predictor.features import build_training_set
+from mlb_predictor.members import DEFAULT_RF_MEMBER, DEFAULT_SVM_MEMBER, MEMBERS, SVM_MEMBER_ENV, make_member
+from mlb_predictor.model import ENSEMBLE_MEMBERS, MLBPredictor, data_version, default_train_jobs
+from mlb_predictor.pipeline import scaled_copy
+
+# Candidate values per member; members without an entry keep their defaults
+SEARCH_SPACES = {
+    "random_forest": {
+        "n_estimators": [50, 100, 200, 400],
+        "max_depth": [None, 4, 8, 16],
+        "min_samples_leaf": [1, 5, 20, 50],
+        "max_features": ["sqrt", 0.5, 1.0],
+    },
+    "svc": {
+        "C": [0.1, 0.3, 1.0, 3.0, 10.0],
+        "gamma": ["scale", 0.01, 0.03, 0.1],
+    },
+    "run_simulator": {
+        "dispersion": [2.0, 4.0, 8.0, None],
+    },
+    "rbf_logistic": {
+        "nystroem__gamma": [0.01, 0.03, 0.1, 0.3],
+        "nystroem__n_components": [100, 200, 400],
+        "logisticregression__C": [0.01, 0.1, 1.0, 10.0],
+    },
+    "hist_gbm": {
+        "learning_rate": [0.02, 0.05, 0.1],
+        "max_leaf_nodes": [7, 15, 31],
+        "min_samples_leaf": [20, 50, 100],
+        "l2_regularization": [0.0, 1.0, 10.0],
+    },
+}
+
+# Forest weights tried for every trial; the SVM slot gets the remainder
+WEIGHT_GRID = np.round(np.linspace(0.0, 1.0, 21), 2)
+
+CACHE_DIR = os.path.join(".cache", "folds")
+# Bumped when the cached fold contents change, so older caches are not reused
+FOLD_FORMAT = 3
+
+
+def sample_configs(members, n_trials, seed=0):
+    """Up to ``n_trials`` distinct {slot: params} dicts drawn from the members' search spaces"""
+    rng = np.random.default_rng(seed)
+    grids = {}
+    for slot, member in members.items():
+        space = SEARCH_SPACES.get(member, {})
+        grids[slot] = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    combinations = list(itertools.product(*grids.values()))
+    chosen = rng.choice(len(combinations), size=min(n_trials, len(combinations)), replace=False)
+    return [dict(zip(grids, combinations[i])) for i in sorted(chosen)]
+
+
+def cache_folds(X, y, n_splits, cache_dir=CACHE_DIR):
+    """Write raw and scaled train/validation matrices for each time-series fold; returns their paths
+
+    Folds are listed most recent first. Files are keyed by the training set's
+    content hash, so repeated runs on the same data reuse them.
+    """
+    fold_dir = os.path.join(cache_dir, f"{data_version(X, y)}-{n_splits}-{FOLD_FORMAT}")
+    paths = [os.path.join(fold_dir, f"fold-{i}.joblib") for i in range(n_splits)]
+    if all(os.path.exists(path) for path in paths):
+        return paths[::-1]
+
+    os.makedirs(fold_dir, exist_ok=True)
+    for path, (train, val) in zip(paths, TimeSeriesSplit(n_splits=n_splits).split(X)):
+        scaler = StandardScaler().fit(X[train])
+        fold = {
+            "X_train": scaled_copy(X[train], scaler), "y_train": y[train],
+            "X_val": scaled_copy(X[val], scaler), "y_val": y[val],
+            "X_train_raw": X[train], "X_val_raw": X[val],
+        }
+        # Write then rename so an interrupted run never leaves a truncated fold behind
+        joblib.dump(fold, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return paths[::-1]
+
+
+def _fold_proba(member, params, fold_path):
+    """Validation-set cover probabilities of one member fitted on one cached fold"""
+    fold = joblib.load(fold_path, mmap_mode="r")
+    estimator = make_member(member, params)
+    if "n_jobs" in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    # One core per task; parallelism comes from running tasks side by side
+    suffix = "_raw" if getattr(estimator, "raw_features", False) else ""
+    with threadpool_limits(limits=1):
+        estimator.fit(fold["X_train" + suffix], fold["y_train"])
+        return estimator.predict_proba(fold["X_val" + suffix])[:, 1]
+
+
+def best_weight(rf_prob, svm_prob, y):
+    """(forest weight, Brier score) minimizing the ensemble's Brier score over WEIGHT_GRID"""
+    blended = WEIGHT_GRID[:, None] * rf_prob + (1 - WEIGHT_GRID[:, None]) * svm_prob
+    brier = ((blended - y) ** 2).mean(axis=1)
+    best = int(np.argmin(brier))
+    return float(WEIGHT_GRID[best]), float(brier[best])
+
+
+def successive_halving(configs, members, fold_paths, eta=3, n_jobs=1, report=print):
+    """Score ``configs`` with pruning; returns (trial index, weight, Brier) per survivor, best first"""
+    y_val = [joblib.load(path, mmap_mode="r")["y_val"] for path in fold_paths]
+    # (trial, slot, fold) -> validation probabilities; promoted trials reuse earlier folds
+    probabilities = {}
+    alive = list(range(len(configs)))
+    n_folds = 1
+    with Parallel(n_jobs=n_jobs, backend="loky") as parallel:
+        while True:
+            tasks = [
+                (trial, slot, fold)
+                for trial in alive for slot in ENSEMBLE_MEMBERS for fold in range(n_folds)
+                if (trial, slot, fold) not in probabilities
+            ]
+            results = parallel(
+                delayed(_fold_proba)(members[slot], configs[trial][slot], fold_paths[fold])
+                for trial, slot, fold in tasks
+            )
+            probabilities.update(zip(tasks, results))
+
+            y = np.concatenate(y_val[:n_folds])
+            scores = []
+            for trial in alive:
+                rf_prob, svm_prob = (
+                    np.concatenate([probabilities[trial, slot, fold] for fold in range(n_folds)])
+                    for slot in ENSEMBLE_MEMBERS
+                )
+                scores.append((trial, *best_weight(rf_prob, svm_prob, y)))
+            scores.sort(key=lambda score: score[2])
+            report(f"{len(alive):4d} trials on {n_folds} fold(s): best Brier {scores[0][2]:.4f}")
+
+            if n_folds == len(fold_paths):
+                return scores
+            alive = [trial for trial, _, _ in scores[:max(1, math.ceil(len(alive) / eta))]]
+            n_folds = min(len(fold_paths), n_folds * eta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune hyperparameters and ensemble weights")
+    parser.add_argument("--games", help="CSV of completed games, in date order (default: synthetic data)")
+    parser.add_argument("--samples", type=int, default=1000, help="synthetic rows when --games is not given")
+    parser.add_argument("--svm-member", choices=sorted(MEMBERS),
+                        help=f"estimator for the SVM slot (default ${SVM_MEMBER_ENV} or svc)")
+    parser.add_argument("--trials", type=int, default=27, help="configurations sampled")
+    parser.add_argument("--splits", type=int, default=5, help="time-series folds")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of trials per halving round")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=default_train_jobs(), help="parallel fold fits")
+    parser.add_argument("--models-dir", default="models", help="directory holding artifact bundles")
+    parser.add_argument("--no-publish", action="store_true", help="report the winner without saving an artifact")
+    args = parser.parse_args(argv)
+
+    if args.games:
+        X, y, _ = build_training_set(pd.read_csv(args.games).to_dict("records"))
+    else:
+        X, y = MLBPredictor(n_jobs=1).generate_training_data(args.samples)
+
+    members = {
+        "model_rf": DEFAULT_RF_MEMBER,
+        "model_svm": args.svm_member or os.environ.get(SVM_MEMBER_ENV, DEFAULT_SVM_MEMBER),
+    }
+    configs = sample_configs(members, args.trials, args.seed)
+    fold_paths = cache_folds(X, y, args.splits)
+    scores = successive_halving(configs, members, fold_paths, args.eta, args.jobs)
+
+    trial, rf_weight, brier = scores[0]
+    weights = {"model_rf": rf_weight, "model_svm": round(1 - rf_weight, 2)}
+    tuning = {
+        "cv_brier": brier,
+        "splits": args.splits,
+        "trials": len(configs),
+        "eta": args.eta,
+        "seed": args.seed,
+        "data_version": data_version(X, y),
+    }
+    print(json.dumps({"params": configs[trial], "weights": weights, "tuning": tuning}, indent=2))
+    if args.no_publish:
+        return
+
+    predictor = MLBPredictor(
+        members["model_rf"], members["model_svm"], n_jobs=args.jobs,
+        params=configs[trial], weights=weights, tuning=tuning,
+    )
+    rf_acc, svm_acc = predictor.train_models(X, y, source="games" if args.games else "synthetic")
+    bundle_dir = predictor.save(args.models_dir)
+    print(f"Saved {predictor.artifact_version} to {bundle_dir} (RF {rf_acc:.1%}, SVM {svm_acc:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,15 @@
+import math
+import os
+from statistics import mean
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import requests
-from datetime import datetime, timedelta
-import joblib
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import plotly.express as px
-import plotly.graph_objects as go
+
+from mlb_predictor.live import LiveOdds, apply_deltas, sources_from_env
+from mlb_predictor.scheduler import PredictionScheduler
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+# Seconds between checks for live line moves; only the predictions list reruns
+LIVE_REFRESH_SECONDS = 2
 
 # Set page config
 st.set_page_config(
@@ -45,129 +45,75 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class MLBPredictor:
-    def __init__(self):
-        self.model_rf = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model_svm = SVC(probability=True, random_state=42)
-        self.scaler = StandardScaler()
-        self.is_trained = False
-
-    def generate_training_data(self, n_samples=1000):
-        """Generate synthetic training data for demonstration"""
-        np.random.seed(42)
-
-        # Team statistics
-        home_win_pct = np.random.normal(0.5, 0.15, n_samples)
-        away_win_pct = np.random.normal(0.5, 0.15, n_samples)
-        home_runs_per_game = np.random.normal(4.5, 1.0, n_samples)
-        away_runs_per_game = np.random.normal(4.5, 1.0, n_samples)
-        home_era = np.random.normal(4.0, 0.8, n_samples)
-        away_era = np.random.normal(4.0, 0.8, n_samples)
-
-        features = np.column_stack([
-            home_win_pct, away_win_pct,
-            home_runs_per_game, away_runs_per_game,
-            home_era, away_era,
-            np.random.normal(0, 0.1, n_samples),
-            np.random.normal(0, 0.05, n_samples)
-        ])
-
-        # Create target
-        prob_cover = (
-            0.3 + 
-            0.3 * (home_win_pct - away_win_pct) +
-            0.2 * (away_era - home_era) / 2 +
-            0.1 * (home_runs_per_game - away_runs_per_game) / 2 +
-            0.1 * np.random.normal(0, 0.1, n_samples)
-        )
-
-        targets = np.random.binomial(1, np.clip(prob_cover, 0.1, 0.9), n_samples)
-        return features, targets
-
-    def train_models(self):
-        """Train the ensemble models"""
-        X, y = self.generate_training_data()
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-
-        self.model_rf.fit(X_train_scaled, y_train)
-        self.model_svm.fit(X_train_scaled, y_train)
-
-        rf_accuracy = self.model_rf.score(X_test_scaled, y_test)
-        svm_accuracy = self.model_svm.score(X_test_scaled, y_test)
-
-        self.is_trained = True
-        return rf_accuracy, svm_accuracy
-
-    def predict_game(self, home_team_stats, away_team_stats):
-        """Predict outcome for a single game"""
-        if not self.is_trained:
-            self.train_models()
-
-        features = np.array([
-            home_team_stats['win_pct'], away_team_stats['win_pct'],
-            home_team_stats['runs_per_game'], away_team_stats['runs_per_game'],
-            home_team_stats['era'], away_team_stats['era'],
-            0.05, 0.0
-        ]).reshape(1, -1)
-
-        features_scaled = self.scaler.transform(features)
-
-        rf_prob = self.model_rf.predict_proba(features_scaled)[0][1]
-        svm_prob = self.model_svm.predict_proba(features_scaled)[0][1]
+@st.cache_resource
+def get_live_odds():
+    """Start the one live odds stream, or None when no odds source is configured"""
+    sources = sources_from_env()
+    if not sources:
+        return None
+    live = LiveOdds(sources)
+    live.start()
+    return live
+
+@st.cache_resource
+def get_scheduler():
+    """Start the one background worker that publishes prediction snapshots"""
+    scheduler = PredictionScheduler(MODELS_DIR, live=get_live_odds())
+    scheduler.start()
+    return scheduler
+
+def format_price(price):
+    """" (+120)" style suffix for an American price, empty when unknown"""
+    return "" if price is None or math.isnan(price) else f" ({price:+.0f})"
+
+def format_percent(value):
+    """"57.1%", or "n/a" for a market that was not priced"""
+    return "n/a" if value is None or math.isnan(value) else f"{value:.1f}%"
+
+def format_total(total, over):
+    """"Total 8.5: Over 52.3%", or "Total: n/a" when no line is quoted"""
+    if total is None or math.isnan(total):
+        return "<strong>Total:</strong> n/a"
+    return f"<strong>Total {total:g}:</strong> Over {format_percent(over)}"
+
+def game_card(rank, pred):
+    """Card markup for one prediction row; every figure is the labeled home line's
+
+    The moneyline and total come from the uncalibrated run model and say so.
+    """
+    home = pred['matchup'].split(" @ ")[-1]
+    return f"""
+            <div class="game-card {pred['card_class']}">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <h3>#{rank} {pred['matchup']}</h3>
+                        <p><strong>Spread:</strong> {pred['spread']}{format_price(pred['price'])} | <strong>Time:</strong> {pred['time']}</p>
+                        <p><strong>Moneyline:</strong> {home} {format_percent(pred['home_win'])} | {format_total(pred['total'], pred['over'])} <em>(uncalibrated)</em></p>
+                    </div>
+                    <div style="text-align: right;">
+                        <h2>{pred['confidence']:.1f}%</h2>
+                        <p><strong>{pred['recommendation']}</strong> | Edge {pred['edge']:+.1f}</p>
+                    </div>
+                </div>
+            </div>
+            """
 
-        ensemble_prob = 0.6 * rf_prob + 0.4 * svm_prob
-        return ensemble_prob
+def render_predictions(predictions, confidence_threshold, show_all_games):
+    if not show_all_games:
+        predictions = [p for p in predictions if p["confidence"] >= confidence_threshold]
 
-def get_todays_games():
-    """Get today's MLB games"""
-    games = [
-        {"home": "LAD", "away": "NYM", "spread": -1.5, "time": "10:10 PM"},
-        {"home": "TOR", "away": "PHI", "spread": 1.5, "time": "7:07 PM"},
-        {"home": "PIT", "away": "HOU", "spread": 1.5, "time": "7:05 PM"},
-        {"home": "SF", "away": "SD", "spread": -1.5, "time": "10:15 PM"},
-        {"home": "STL", "away": "KC", "spread": -1.5, "time": "8:15 PM"},
-        {"home": "NYY", "away": "BOS", "spread": -1.5, "time": "7:05 PM"},
-        {"home": "CHC", "away": "MIL", "spread": 1.5, "time": "8:05 PM"},
-        {"home": "TEX", "away": "SEA", "spread": -1.5, "time": "8:05 PM"},
-        {"home": "ATL", "away": "WSH", "spread": -1.5, "time": "7:20 PM"},
-        {"home": "CLE", "away": "DET", "spread": -1.5, "time": "7:10 PM"},
-        {"home": "OAK", "away": "MIN", "spread": 1.5, "time": "10:07 PM"},
-        {"home": "TB", "away": "BAL", "spread": 1.5, "time": "7:10 PM"}
-    ]
-    return games
+    for i, pred in enumerate(predictions, 1):
+        with st.container():
+            st.markdown(game_card(i, pred), unsafe_allow_html=True)
 
-def get_team_stats():
-    """Get team statistics"""
-    teams = {
-        "LAD": {"win_pct": 0.62, "runs_per_game": 5.1, "era": 3.45},
-        "NYM": {"win_pct": 0.55, "runs_per_game": 4.8, "era": 3.89},
-        "TOR": {"win_pct": 0.48, "runs_per_game": 4.6, "era": 4.12},
-        "PHI": {"win_pct": 0.58, "runs_per_game": 5.0, "era": 3.76},
-        "PIT": {"win_pct": 0.45, "runs_per_game": 4.2, "era": 4.34},
-        "HOU": {"win_pct": 0.61, "runs_per_game": 5.2, "era": 3.67},
-        "SF": {"win_pct": 0.52, "runs_per_game": 4.7, "era": 3.98},
-        "SD": {"win_pct": 0.49, "runs_per_game": 4.5, "era": 4.05},
-        "STL": {"win_pct": 0.53, "runs_per_game": 4.8, "era": 4.01},
-        "KC": {"win_pct": 0.47, "runs_per_game": 4.4, "era": 4.18},
-        "NYY": {"win_pct": 0.59, "runs_per_game": 5.3, "era": 3.55},
-        "BOS": {"win_pct": 0.51, "runs_per_game": 4.9, "era": 4.08},
-        "CHC": {"win_pct": 0.46, "runs_per_game": 4.3, "era": 4.25},
-        "MIL": {"win_pct": 0.54, "runs_per_game": 4.9, "era": 3.82},
-        "TEX": {"win_pct": 0.56, "runs_per_game": 5.0, "era": 3.94},
-        "SEA": {"win_pct": 0.50, "runs_per_game": 4.6, "era": 4.15},
-        "ATL": {"win_pct": 0.60, "runs_per_game": 5.1, "era": 3.59},
-        "WSH": {"win_pct": 0.44, "runs_per_game": 4.1, "era": 4.41},
-        "CLE": {"win_pct": 0.57, "runs_per_game": 4.8, "era": 3.71},
-        "DET": {"win_pct": 0.43, "runs_per_game": 4.0, "era": 4.52},
-        "OAK": {"win_pct": 0.41, "runs_per_game": 3.9, "era": 4.68},
-        "MIN": {"win_pct": 0.49, "runs_per_game": 4.5, "era": 4.21},
-        "TB": {"win_pct": 0.52, "runs_per_game": 4.7, "era": 3.91},
-        "BAL": {"win_pct": 0.54, "runs_per_game": 4.8, "era": 3.85}
-    }
-    return teams
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_predictions(live, confidence_threshold, show_all_games):
+    """Predictions kept current by this session's live odds subscription"""
+    if "live_odds" not in st.session_state:
+        st.session_state.live_odds = live.subscribe()
+        st.session_state.live_rows = {}
+    apply_deltas(st.session_state.live_rows, st.session_state.live_odds.drain())
+    render_predictions(list(st.session_state.live_rows.values()), confidence_threshold, show_all_games)
 
 def main():
     # Header
@@ -185,66 +131,16 @@ def main():
     if st.sidebar.button("🔄 Refresh Predictions"):
         st.rerun()
 
-    # Initialize predictor
-    predictor = MLBPredictor()
-
-    # Train models
-    if 'models_trained' not in st.session_state:
-        with st.spinner("Training prediction models..."):
-            rf_acc, svm_acc = predictor.train_models()
-            st.session_state.models_trained = True
-            st.session_state.rf_accuracy = rf_acc
-            st.session_state.svm_accuracy = svm_acc
-    else:
-        predictor.train_models()
-
-    # Get data
-    games = get_todays_games()
-    team_stats = get_team_stats()
-
-    # Process predictions
-    predictions = []
-    for game in games:
-        home_stats = team_stats[game["home"]]
-        away_stats = team_stats[game["away"]]
-
-        confidence = predictor.predict_game(home_stats, away_stats) * 100
-
-        if game["spread"] < 0:
-            favorite = game["home"]
-            spread_text = f"{favorite} {game['spread']}"
-        else:
-            favorite = game["away"]
-            spread_text = f"{favorite} {-game['spread']}"
-
-        implied_prob = 52.4
-        edge = confidence - implied_prob
-
-        if confidence >= 70:
-            recommendation = "STRONG BET"
-            card_class = "strong-bet"
-        elif confidence >= 60:
-            recommendation = "GOOD BET"
-            card_class = "good-bet"
-        elif confidence >= 55:
-            recommendation = "FAIR BET"
-            card_class = "fair-bet"
-        else:
-            recommendation = "PASS"
-            card_class = "pass-bet"
-
-        predictions.append({
-            "matchup": f"{game['away']} @ {game['home']}",
-            "spread": spread_text,
-            "confidence": confidence,
-            "recommendation": recommendation,
-            "edge": edge,
-            "time": game["time"],
-            "card_class": card_class
-        })
-
-    # Sort by confidence
-    predictions.sort(key=lambda x: x["confidence"], reverse=True)
+    # Predictions are precomputed in the background; only read the latest snapshot
+    scheduler = get_scheduler()
+    if not scheduler.ready.is_set():
+        with st.spinner("Preparing today's predictions..."):
+            scheduler.ready.wait()
+    snapshot = scheduler.snapshot
+    if snapshot is None:
+        st.error(f"Predictions are not available yet: {scheduler.last_error}")
+        st.stop()
+    predictions = list(snapshot.predictions)
 
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -254,42 +150,29 @@ def main():
         strong_bets = len([p for p in predictions if p["recommendation"] == "STRONG BET"])
         st.metric("Strong Bets", strong_bets)
     with col3:
-        avg_confidence = np.mean([p["confidence"] for p in predictions])
+        avg_confidence = mean(p["confidence"] for p in predictions) if predictions else 0.0
         st.metric("Avg Confidence", f"{avg_confidence:.1f}%")
     with col4:
-        st.metric("Last Updated", datetime.now().strftime("%H:%M"))
-
-    # Filter games if needed
-    if not show_all_games:
-        predictions = [p for p in predictions if p["confidence"] >= confidence_threshold]
+        st.metric("Last Updated", snapshot.created_at.strftime("%H:%M"))
 
-    # Display predictions
+    # Display predictions; with live odds, line moves update this list in place
     st.subheader("🎯 Today's Predictions")
-
-    for i, pred in enumerate(predictions, 1):
-        with st.container():
-            st.markdown(f"""
-            <div class="game-card {pred['card_class']}">
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <div>
-                        <h3>#{i} {pred['matchup']}</h3>
-                        <p><strong>Spread:</strong> {pred['spread']} | <strong>Time:</strong> {pred['time']}</p>
-                    </div>
-                    <div style="text-align: right;">
-                        <h2>{pred['confidence']:.1f}%</h2>
-                        <p><strong>{pred['recommendation']}</strong></p>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    live = get_live_odds()
+    if live is not None:
+        live_predictions(live, confidence_threshold, show_all_games)
+    else:
+        render_predictions(predictions, confidence_threshold, show_all_games)
 
     # Model performance section
     with st.expander("📊 Model Performance"):
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Random Forest Accuracy", f"{st.session_state.rf_accuracy:.1%}")
+            st.metric("Random Forest Accuracy", f"{snapshot.rf_accuracy:.1%}")
         with col2:
-            st.metric("SVM Accuracy", f"{st.session_state.svm_accuracy:.1%}")
+            st.metric("SVM Accuracy", f"{snapshot.svm_accuracy:.1%}")
+        with col3:
+            hit_ratio = snapshot.cache_hit_ratio
+            st.metric("Prediction Cache Hits", "n/a" if hit_ratio is None else f"{hit_ratio:.0%}")
 
         st.info("Models are retrained daily with updated team statistics.")
 
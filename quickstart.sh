@@ -28,6 +28,10 @@ else
     exit 1
 fi
 
+# Publish a model artifact so the app starts without training
+echo "🧠 Training prediction models..."
+python3 -m mlb_predictor.train
+
 # Run the application
 echo "🏃 Starting MLB Predictor..."
 echo "🌐 Your app will open at: http://localhost:8501"
@@ -0,0 +1,26 @@
+"""Game cards rendered by the Streamlit app"""
+import os
+import sys
+from datetime import date
+
+import numpy as np
+
+from mlb_predictor import get_todays_games
+from mlb_predictor.ingest import FixtureSource
+from mlb_predictor.recommendations import build_predictions
+from mlb_predictor.tables import TEAMS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mlb_predictor_app import game_card  # noqa: E402
+
+
+def test_away_favorite_card_shows_the_labeled_price():
+    slate = get_todays_games(FixtureSource(os.path.join(ROOT, "fixtures", "demo")), day=date(2024, 6, 1))
+    rows = {row["matchup"]: row for row in build_predictions(slate, TEAMS, np.full(len(slate), 0.6))}
+    # Philadelphia is favored at Toronto; the card prices Toronto's +1.5, the line it names
+    card = game_card(1, rows["PHI @ TOR"])
+    assert "TOR +1.5 (-108)" in card
+    assert "Edge +8.1" in card
+    assert "(uncalibrated)" in card
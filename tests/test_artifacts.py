@@ -0,0 +1,26 @@
+"""Saving and loading versioned model bundles"""
+import numpy as np
+
+from mlb_predictor import MLBPredictor, data_version, latest_artifact_version
+
+
+def test_save_and_load_after_fit(tmp_path):
+    predictor = MLBPredictor(svm_member="sgd_logistic", n_jobs=1)
+    X, y = predictor.generate_training_data(200)
+    bundle_dir = predictor.fit(X, y).save(str(tmp_path))
+
+    loaded = MLBPredictor.load(bundle_dir)
+    assert loaded.data_version == data_version(X, y)
+    assert loaded.training_source == "games"
+    np.testing.assert_allclose(loaded.predict_features(X[:20]), predictor.predict_features(X[:20]))
+
+
+def test_save_never_overwrites_a_bundle(tmp_path):
+    predictor = MLBPredictor(svm_member="sgd_logistic", n_jobs=1)
+    predictor.fit(*predictor.generate_training_data(200))
+    # Same data, same second: each save still gets its own bundle
+    first = predictor.save(str(tmp_path))
+    second = predictor.save(str(tmp_path))
+    assert first != second
+    assert latest_artifact_version(str(tmp_path)) == predictor.artifact_version
+    assert MLBPredictor.load(first).artifact_version != MLBPredictor.load(second).artifact_version
@@ -0,0 +1,11 @@
+"""The headless predict command"""
+import pytest
+
+from mlb_predictor.cli import predict_main
+
+
+def test_demo_slate_rejects_a_date_range(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        predict_main(["--date", "2024-06-01", "--end-date", "2024-06-02", "--models-dir", str(tmp_path)])
+    assert exit_info.value.code == 2
+    assert "demo slate" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+"""CompiledForest against the scikit-learn forest it was compiled from"""
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from mlb_predictor import MLBPredictor
+from mlb_predictor.forest import compile_forest
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = MLBPredictor().generate_training_data(1500)
+    X_test, _ = MLBPredictor().generate_training_data(700, seed=1)
+    return X, y, X_test
+
+
+@pytest.mark.parametrize("forest", [
+    RandomForestClassifier(n_estimators=30, random_state=0),
+    RandomForestClassifier(n_estimators=30, max_depth=6, class_weight="balanced", random_state=0),
+    RandomForestClassifier(n_estimators=30, class_weight="balanced_subsample", min_samples_leaf=5, random_state=0),
+    ExtraTreesClassifier(n_estimators=30, random_state=0),
+], ids=["default", "balanced", "balanced_subsample", "extra_trees"])
+def test_predict_proba_is_bit_identical(data, forest):
+    X, y, X_test = data
+    # Single-threaded, so scikit-learn adds the trees up in order
+    forest.set_params(n_jobs=1).fit(X, y)
+    compiled = compile_forest(forest)
+    # More rows than one scoring chunk
+    assert np.array_equal(compiled.predict_proba(X_test), forest.predict_proba(X_test))
+    assert np.array_equal(compiled.predict(X_test), forest.predict(X_test))
+
+
+def test_missing_values(data):
+    X, y, X_test = data
+    rng = np.random.default_rng(0)
+    X = np.where(rng.random(X.shape) < 0.05, np.nan, X)
+    X_test = np.where(rng.random(X_test.shape) < 0.05, np.nan, X_test)
+    forest = RandomForestClassifier(n_estimators=30, random_state=0, n_jobs=1).fit(X, y)
+    assert np.array_equal(compile_forest(forest).predict_proba(X_test), forest.predict_proba(X_test))
+
+
+def test_rejects_unfitted_forest():
+    with pytest.raises(ValueError):
+        compile_forest(RandomForestClassifier())
@@ -0,0 +1,18 @@
+"""Incremental retraining"""
+import numpy as np
+
+from mlb_predictor import MLBPredictor, get_team_stats, get_todays_games
+
+
+def test_sgd_logistic_update():
+    X, y = MLBPredictor().generate_training_data(600)
+    predictor = MLBPredictor(svm_member="sgd_logistic", n_jobs=1).fit(X[:500], y[:500])
+    dtypes = predictor.model_svm.coef_.dtype, predictor.model_svm.intercept_.dtype
+
+    predictor.update(X[500:], y[500:], X[400:], y[400:])
+    # A second update runs partial_fit on the rescaled weights again
+    predictor.update(X[550:], y[550:], X[450:], y[450:])
+
+    assert (predictor.model_svm.coef_.dtype, predictor.model_svm.intercept_.dtype) == dtypes
+    assert predictor.updates_since_refit == 2
+    assert np.all(np.isfinite(predictor.predict_games(get_todays_games(), get_team_stats())))
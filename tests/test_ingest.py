@@ -0,0 +1,95 @@
+"""Slates built from the recorded demo fixtures"""
+import copy
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+import pytest
+
+from mlb_predictor import get_todays_games
+from mlb_predictor.ingest import ODDS_PARAMS, FixtureSource, fixture_name, parse_quotes
+from mlb_predictor.live import LiveOdds
+from mlb_predictor.tables import TEAMS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "demo")
+DAY = date(2024, 6, 1)
+
+
+@pytest.fixture
+def two_day_feed(tmp_path):
+    """The demo fixtures with tomorrow's NYY-BOS game, at another line, added to the odds feed"""
+    shutil.copytree(FIXTURES, tmp_path, dirs_exist_ok=True)
+    path = tmp_path / fixture_name("odds", ODDS_PARAMS)
+    events = json.loads(path.read_text())
+    today = next(event for event in events if event["home_team"] == "New York Yankees")
+    tomorrow = copy.deepcopy(today)
+    tomorrow.update(id="evt-tomorrow", commence_time="2024-06-02T23:05:00Z")
+    for bookmaker in tomorrow["bookmakers"]:
+        home, away = bookmaker["markets"][0]["outcomes"]
+        home.update(point=1.5, price=-180)
+        away.update(point=-1.5, price=150)
+    # Listed last, so a join on teams alone would take it
+    path.write_text(json.dumps(events + [tomorrow]))
+    return FixtureSource(str(tmp_path))
+
+
+@pytest.fixture
+def split_books(tmp_path):
+    """The demo fixtures with NYY-BOS quoted at -1.5 by one book and +1.5 by another"""
+    shutil.copytree(FIXTURES, tmp_path, dirs_exist_ok=True)
+    path = tmp_path / fixture_name("odds", ODDS_PARAMS)
+    events = json.loads(path.read_text())
+    game = next(event for event in events if event["home_team"] == "New York Yankees")
+    game["bookmakers"] = game["bookmakers"][:2]
+    home, away = game["bookmakers"][1]["markets"][0]["outcomes"]
+    home.update(point=1.5, price=-200)
+    away.update(point=-1.5, price=170)
+    path.write_text(json.dumps(events))
+    return FixtureSource(str(tmp_path))
+
+
+def _game(slate, home, away):
+    return slate[(slate["home"] == TEAMS.index(home)) & (slate["away"] == TEAMS.index(away))][0]
+
+
+def test_demo_fixture_slate():
+    slate = get_todays_games(FixtureSource(FIXTURES), day=DAY)
+    assert len(slate) == 12
+    assert set(slate["date"]) == {"2024-06-01"}
+    # 10:10 PM Eastern is the next day in UTC
+    assert _game(slate, "LAD", "NYM")["time"] == "10:10 PM"
+    assert not np.isnan(slate["price"]).any()
+
+
+def test_odds_matched_on_date(two_day_feed):
+    game = _game(get_todays_games(two_day_feed, day=DAY), "NYY", "BOS")
+    assert game["spread"] == -1.5
+    assert game["price"] != -180
+
+
+def test_split_books_price_an_offered_line(split_books):
+    game = _game(get_todays_games(split_books, day=DAY), "NYY", "BOS")
+    # Lower median of -1.5 and +1.5, priced by the book that offers it
+    assert game["spread"] == -1.5
+    assert game["price"] == -110
+
+
+def test_fetched_totals():
+    slate = get_todays_games(FixtureSource(FIXTURES), day=DAY)
+    assert _game(slate, "LAD", "NYM")["total"] == 8.5
+    # Books split 8.5 / 9: the lower median, a line that is on offer
+    assert _game(slate, "TOR", "PHI")["total"] == 8.5
+    # No book totals Tampa Bay's game
+    assert np.isnan(_game(slate, "TB", "BAL")["total"])
+
+
+def test_live_odds_matched_on_date(two_day_feed):
+    slate = get_todays_games(FixtureSource(FIXTURES), day=DAY)
+    live = LiveOdds([])
+    live.load(slate, TEAMS, np.full(len(slate), 0.5))
+    live.apply(parse_quotes(two_day_feed.fetch("odds", ODDS_PARAMS)), "2024-06-01T12:00")
+    row = live.rows["BOS @ NYY"]
+    assert row["spread"] == "NYY -1.5"
+    assert row["price"] != -180
@@ -0,0 +1,79 @@
+"""LiveOdds driven by the recorded frames in fixtures/live"""
+import asyncio
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+from mlb_predictor import get_todays_games
+from mlb_predictor.ingest import FixtureSource, ReplaySource
+from mlb_predictor.live import LiveOdds, apply_deltas
+from mlb_predictor.recommendations import break_even
+from mlb_predictor.tables import TEAMS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+PROBABILITY = 0.6
+
+# Games whose consensus line or best home price moves in each frame after the first
+MOVES = [
+    {"NYM @ LAD": ("LAD -1.5", -105), "BOS @ NYY": ("NYY -1.5", -102)},
+    {"NYM @ LAD": ("LAD -1.5", 100), "SEA @ TEX": ("TEX -1.5", 120)},
+    {"SD @ SF": ("SF -1.5", 135)},
+]
+
+
+def demo_slate():
+    return get_todays_games(FixtureSource(os.path.join(FIXTURES, "demo")), day=date(2024, 6, 1))
+
+
+@pytest.fixture
+def live():
+    slate = demo_slate()
+    live = LiveOdds([ReplaySource(os.path.join(FIXTURES, "live"))])
+    live.load(slate, TEAMS, np.full(len(slate), PROBABILITY))
+    return live
+
+
+def test_replay_pushes_moved_games(live):
+    subscription = live.subscribe()
+    (primed,) = subscription.drain()
+    assert primed["reset"] and len(primed["rows"]) == 12
+    rows = dict(primed["rows"])
+
+    # The first frame repeats the slate's own odds
+    assert asyncio.run(live.poll()) is None
+    for moves in MOVES:
+        delta = asyncio.run(live.poll())
+        assert not delta["reset"]
+        assert set(delta["rows"]) == set(moves)
+        for matchup, (spread, price) in moves.items():
+            row = delta["rows"][matchup]
+            assert (row["spread"], row["price"]) == (spread, price)
+            assert row["edge"] == pytest.approx(PROBABILITY * 100 - break_even(price))
+            assert row["edge"] != rows[matchup]["edge"]
+    # Past the last frame it keeps replaying it: nothing moves
+    assert asyncio.run(live.poll()) is None
+
+    deltas = subscription.drain()
+    assert len(deltas) == len(MOVES)
+    assert apply_deltas(rows, deltas)
+    assert rows == live.rows
+    assert live.last_error is None
+
+
+def test_load_reprices_new_probabilities(live):
+    for _ in range(len(MOVES) + 1):
+        asyncio.run(live.poll())
+    subscription = live.subscribe()
+    subscription.drain()
+
+    # A scheduler refresh: the slate as fetched, with new probabilities
+    slate = demo_slate()
+    live.load(slate, TEAMS, np.full(len(slate), 0.7))
+    (delta,) = subscription.drain()
+    assert delta["reset"]
+    # It is priced at the latest streamed odds, not the ones it was fetched with
+    row = delta["rows"]["SD @ SF"]
+    assert row["price"] == 135
+    assert row["edge"] == pytest.approx(70 - break_even(135))
@@ -0,0 +1,36 @@
+"""Every market priced from one feature pass"""
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+from mlb_predictor import MARKETS, MLBPredictor, get_team_stats, get_todays_games
+from mlb_predictor.ingest import FixtureSource
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "demo")
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return MLBPredictor(svm_member="sgd_logistic", n_jobs=1).fit(*MLBPredictor().generate_training_data(500))
+
+
+def test_demo_slate_has_every_market(predictor):
+    games = get_todays_games()
+    markets = predictor.predict_markets(games, get_team_stats())
+    assert sorted(markets) == sorted(MARKETS)
+    assert np.array_equal(markets["run_line"], predictor.predict_games(games, get_team_stats()))
+    for values in markets.values():
+        assert np.all((values > 0) & (values < 1))
+
+
+def test_unquoted_total_is_nan(predictor):
+    # The fixture odds total every game but Tampa Bay's
+    games = get_todays_games(FixtureSource(FIXTURES), day=date(2024, 6, 1))
+    markets = predictor.predict_markets(games, get_team_stats())
+    quoted = ~np.isnan(games["total"])
+    assert quoted.sum() == len(games) - 1
+    assert np.isfinite(markets["total"][quoted]).all()
+    assert np.isnan(markets["total"][~quoted]).all()
+    assert np.isfinite(markets["moneyline"]).all()
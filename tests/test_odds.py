@@ -0,0 +1,27 @@
+"""Consensus lines and prices from many books' quotes"""
+import numpy as np
+
+from mlb_predictor.odds import LineHistory, lower_median
+
+
+def _quotes(points, home_prices, away_prices):
+    n = len(points)
+    return {
+        "event": ["evt0"] * n, "home": ["NYY"] * n, "away": ["BOS"] * n,
+        "book": [f"book{i}" for i in range(n)],
+        "point": points, "home_price": home_prices, "away_price": away_prices,
+    }
+
+
+def test_lower_median_is_an_offered_value():
+    values = np.array([[-1.5, 1.5, np.nan, np.nan], [1.5, -1.5, -1.5, 2.5], [np.nan] * 4])
+    assert np.array_equal(lower_median(values), [-1.5, -1.5, np.nan], equal_nan=True)
+
+
+def test_split_books_use_an_offered_line():
+    history = LineHistory()
+    history.record(_quotes([-1.5, 1.5], [130, -160], [-150, 140]), "2024-06-01T12:00")
+    market = history.market()
+    assert market["point"][0] == -1.5
+    assert market["books"][0] == 1
+    assert market["home_price"][0] == 130
@@ -0,0 +1,23 @@
+"""Out-of-core training on synthetic shards"""
+import pytest
+
+from mlb_predictor import MLBPredictor
+from mlb_predictor.members import MAX_FIT_ROWS
+from mlb_predictor.shards import ShardDataset
+from mlb_predictor.synthetic import write_shards
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("shards"))
+    write_shards(directory, 4000, chunk_rows=1000)
+    return ShardDataset(directory)
+
+
+def test_svc_fit_rows_are_capped(dataset, monkeypatch):
+    monkeypatch.setitem(MAX_FIT_ROWS, "svc", 300)
+    predictor = MLBPredictor(svm_member="svc", n_jobs=1)
+    predictor.train_out_of_core(dataset, batch_rows=1000)
+    assert predictor.model_svm.shape_fit_[0] == 300
+    assert predictor.is_trained and predictor.training_source == "shards"
+
@@ -0,0 +1,19 @@
+"""ScoringPipeline's kept scaling buffer"""
+import numpy as np
+
+from mlb_predictor import MLBPredictor
+from mlb_predictor.pipeline import MAX_BUFFER_ROWS
+
+
+def test_buffer_stays_bounded():
+    X, y = MLBPredictor().generate_training_data(2 * MAX_BUFFER_ROWS)
+    predictor = MLBPredictor(svm_member="sgd_logistic", n_jobs=1).fit(X[:2000], y[:2000])
+    pipeline = predictor.scoring_pipeline(compiled=False)
+
+    small = pipeline.predict_proba(X[:100])
+    large = pipeline.predict_proba(X)
+    assert len(pipeline._buffer) == 100
+    # Scaled into its own array or into the buffer, the rows score the same
+    assert np.array_equal(large[:100], small)
+    assert np.array_equal(large[-MAX_BUFFER_ROWS:], pipeline.predict_proba(X[-MAX_BUFFER_ROWS:]))
+    assert len(pipeline._buffer) == MAX_BUFFER_ROWS
@@ -0,0 +1,42 @@
+"""Prediction rows built from a scored slate"""
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from mlb_predictor import get_todays_games
+from mlb_predictor.ingest import ODDS_PARAMS, FixtureSource, fixture_name
+from mlb_predictor.odds import american_to_decimal
+from mlb_predictor.recommendations import PASS_TIER, break_even, build_predictions, recommend, tier_index
+from mlb_predictor.tables import TEAMS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "demo")
+
+
+def _best_home_price(home_team):
+    """Best price quoted for ``home_team``'s own run line in the demo odds fixture"""
+    with open(os.path.join(FIXTURES, fixture_name("odds", ODDS_PARAMS))) as f:
+        event = next(event for event in json.load(f) if event["home_team"] == home_team)
+    prices = [
+        outcome["price"]
+        for bookmaker in event["bookmakers"] for market in bookmaker["markets"] if market["key"] == "spreads"
+        for outcome in market["outcomes"] if outcome["name"] == home_team
+    ]
+    return max(prices, key=american_to_decimal)
+
+
+def test_away_favorite_row_describes_the_home_side():
+    games = get_todays_games(FixtureSource(FIXTURES), day=date(2024, 6, 1))
+    rows = {row["matchup"]: row for row in build_predictions(games, TEAMS, np.full(len(games), 0.6))}
+    # Philadelphia is favored at Toronto: the row is Toronto's +1.5, at Toronto's price
+    row = rows["PHI @ TOR"]
+    assert row["spread"] == "TOR +1.5"
+    assert row["price"] == _best_home_price("Toronto Blue Jays")
+    assert row["edge"] == 60 - break_even(row["price"])
+    assert rows["NYM @ LAD"]["spread"] == "LAD -1.5"
+
+
+def test_missing_confidence_is_a_pass():
+    assert list(tier_index([75, 65, 57, 40, np.nan])) == [0, 1, 2, 3, 3]
+    assert recommend(np.nan) == PASS_TIER
@@ -0,0 +1,45 @@
+"""Background retraining policy of PredictionScheduler"""
+import json
+import os
+
+import pytest
+
+from mlb_predictor import MLBPredictor
+from mlb_predictor.model import MANIFEST_FILE, latest_artifact_version
+from mlb_predictor.scheduler import PredictionScheduler
+
+
+def _publish(models_dir, source, created_at="2020-01-01T00:00:00Z"):
+    """Save a small model trained from ``source`` and backdate its manifest"""
+    predictor = MLBPredictor(svm_member="sgd_logistic", n_jobs=1)
+    predictor.train_models(*predictor.generate_training_data(200), source=source)
+    bundle_dir = predictor.save(models_dir)
+    path = os.path.join(bundle_dir, MANIFEST_FILE)
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest["created_at"] = created_at
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    return predictor.artifact_version
+
+
+@pytest.mark.parametrize("source", ["games", "shards"])
+def test_stale_real_model_is_kept(tmp_path, source):
+    version = _publish(str(tmp_path), source)
+    predictor = PredictionScheduler(str(tmp_path))._current_predictor()
+    assert predictor.artifact_version == version
+    assert latest_artifact_version(str(tmp_path)) == version
+
+
+def test_stale_synthetic_model_is_retrained(tmp_path):
+    version = _publish(str(tmp_path), "synthetic")
+    predictor = PredictionScheduler(str(tmp_path))._current_predictor()
+    assert predictor.artifact_version != version
+    assert predictor.training_source == "synthetic"
+    assert latest_artifact_version(str(tmp_path)) == predictor.artifact_version
+
+
+def test_bootstrap_without_artifact(tmp_path):
+    predictor = PredictionScheduler(str(tmp_path))._current_predictor()
+    assert predictor.training_source == "synthetic"
+    assert latest_artifact_version(str(tmp_path)) == predictor.artifact_version
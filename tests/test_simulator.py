@@ -0,0 +1,37 @@
+"""The run simulator member priced at each game's own line"""
+import numpy as np
+
+from mlb_predictor import MLBPredictor, get_team_stats, get_todays_games
+from mlb_predictor.prediction_cache import PredictionCache
+from mlb_predictor.simulator import RunLineSimulator
+
+
+def test_member_prices_the_given_lines():
+    predictor = MLBPredictor()
+    X, y = predictor.generate_training_data(200)
+    simulator = RunLineSimulator().fit(X, y)
+    rows = np.repeat(X[:1], 3, axis=0)
+    cover = simulator.predict_proba(rows, np.array([-1.5, 1.5, np.nan]))[:, 1]
+    assert cover[1] > cover[0]
+    # No line: the default -1.5
+    assert cover[2] == cover[0] == simulator.predict_proba(rows[:1])[0, 1]
+
+
+def test_slate_lines_reach_the_simulator():
+    predictor = MLBPredictor(svm_member="run_simulator", n_jobs=1)
+    predictor.fit(*predictor.generate_training_data(200))
+    games = get_todays_games()
+    underdogs = games["spread"] > 0
+    assert underdogs.any() and (~underdogs).any()
+    at_default = games.copy()
+    at_default["spread"] = -1.5
+
+    probabilities = predictor.predict_games(games, get_team_stats())
+    default = predictor.predict_games(at_default, get_team_stats())
+    assert np.all(probabilities[underdogs] > default[underdogs])
+    assert np.array_equal(probabilities[~underdogs], default[~underdogs])
+
+    # Cached probabilities are keyed on the line too
+    predictor.cache = PredictionCache()
+    predictor.predict_games(at_default, get_team_stats())
+    np.testing.assert_array_equal(predictor.predict_games(games, get_team_stats()), probabilities)